@@ -0,0 +1,30 @@
+"""
+Re-run background identification jobs lost by a worker restart.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scanner.tasks import get_executor, recover_identifications, run_identification
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue pending identification jobs older than, and processing ones "
+        "claimed longer ago than, PLANT_ID_JOB_STALE_AFTER again and run "
+        "them here; jobs older than "
+        "PLANT_ID_JOB_EXPIRE_AFTER are marked failed. Run it at deploy and "
+        "periodically (e.g. from cron)."
+    )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        pks, expired = recover_identifications()
+        executor = get_executor()
+        for pk in pks:
+            executor.submit(run_identification, pk)
+        executor.shutdown(wait=True)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-ran {len(pks)} stale identifications and failed {expired} expired ones in {elapsed:.2f}s"
+        ))
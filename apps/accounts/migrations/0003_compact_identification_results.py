@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:41
+
+import json
+import zlib
+
+from django.db import migrations, models
+
+RESULT_FIELDS = ("plant_name", "common_name", "scientific_name", "confidence", "match_score")
+
+
+def compact_legacy_responses(apps, schema_editor):
+    """Rewrite unversioned api_response rows into the compact v2 schema."""
+    PlantIdentificationHistory = apps.get_model("accounts", "PlantIdentificationHistory")
+    legacy = PlantIdentificationHistory.objects.exclude(api_response__has_key="version")
+
+    batch = []
+    for history in legacy.iterator(chunk_size=500):
+        results = history.api_response.get("results") or []
+        raw = [result.get("api_data") for result in results if result.get("api_data")]
+        compact = [
+            {
+                **{field: result.get(field) for field in RESULT_FIELDS},
+                "plant": history.identified_plant_id if i == 0 else None,
+            }
+            for i, result in enumerate(results[:3])
+        ]
+        history.api_response = {
+            "version": 2,
+            "best_match": compact[0] if compact else None,
+            "results": compact,
+        }
+        if raw:
+            history.raw_response = zlib.compress(json.dumps(raw).encode())
+        batch.append(history)
+
+        if len(batch) >= 500:
+            PlantIdentificationHistory.objects.bulk_update(batch, ["api_response", "raw_response"])
+            batch = []
+
+    if batch:
+        PlantIdentificationHistory.objects.bulk_update(batch, ["api_response", "raw_response"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_identification_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plantidentificationhistory",
+            name="raw_response",
+            field=models.BinaryField(
+                blank=True,
+                help_text="zlib-compressed upstream API payload for debugging",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="plantidentificationhistory",
+            name="api_response",
+            field=models.JSONField(
+                help_text="Compact, versioned identification results"
+            ),
+        ),
+        migrations.RunPython(compact_legacy_responses, migrations.RunPython.noop),
+    ]
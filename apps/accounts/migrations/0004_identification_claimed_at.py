@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_compact_identification_results"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plantidentificationhistory",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
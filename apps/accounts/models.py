@@ -1,6 +1,9 @@
 """
 User models for the accounts app.
 """
+import json
+import zlib
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from apps.plants.models import Plant
@@ -123,6 +126,13 @@ class PlantIdentificationHistory(models.Model):
     """
     Track plant identification attempts by users.
     """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='identification_history')
     image = models.ImageField(upload_to='identifications/')
     
@@ -134,8 +144,18 @@ class PlantIdentificationHistory(models.Model):
         blank=True,
         help_text="Plant that was identified (if any)"
     )
-    api_response = models.JSONField(help_text="Full API response for debugging")
+    api_response = models.JSONField(help_text="Compact, versioned identification results")
+    raw_response = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="zlib-compressed upstream API payload for debugging"
+    )
     confidence_score = models.FloatField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='completed')
+    # When a background worker last claimed the job (set with status='processing')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
     
     # User feedback
     user_confirmed = models.BooleanField(null=True, blank=True)
@@ -150,3 +170,15 @@ class PlantIdentificationHistory(models.Model):
     def __str__(self):
         plant_name = self.identified_plant.name if self.identified_plant else "Unknown"
         return f"{self.user.username} - {plant_name} ({self.created_at.date()})"
+    
+    @property
+    def raw_response_data(self):
+        """Decompressed upstream API payload, if it was stored"""
+        if not self.raw_response:
+            return None
+        return json.loads(zlib.decompress(bytes(self.raw_response)))
+    
+    @property
+    def is_finished(self):
+        """Check if the identification job has stopped running"""
+        return self.status in ('completed', 'failed')
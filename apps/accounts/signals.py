@@ -0,0 +1,39 @@
+"""
+Signal handlers for the accounts app.
+"""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.finder.personalization import invalidate_user_recommendations
+from .models import User, UserPlantCollection
+
+
+def _invalidate_on_commit(user_pk):
+    transaction.on_commit(lambda: invalidate_user_recommendations(user_pk))
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_recommendations(sender, instance, created, update_fields=None, **kwargs):
+    """Profile edits change the user's feature vector; logins do not."""
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    _invalidate_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=UserPlantCollection)
+@receiver(post_delete, sender=UserPlantCollection)
+def invalidate_collection_recommendations(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.user_id)
+
+
+@receiver(m2m_changed, sender=User.favorite_plants.through)
+def invalidate_favorite_recommendations(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _invalidate_on_commit(instance.pk)
+    elif pk_set:
+        # Changed from the plant side: every affected user
+        for user_pk in pk_set:
+            _invalidate_on_commit(user_pk)
@@ -72,4 +72,6 @@ class IdentificationHistoryView(LoginRequiredMixin, ListView):
     paginate_by = 10
     
     def get_queryset(self):
-        return PlantIdentificationHistory.objects.filter(user=self.request.user).order_by('-created_at')
+        return PlantIdentificationHistory.objects.filter(
+            user=self.request.user
+        ).defer('raw_response').select_related('identified_plant').order_by('-created_at')
@@ -0,0 +1,41 @@
+"""
+View mixins for the API app.
+"""
+from apps.core.conditional import conditional_response, make_etag, patch_catalog_headers
+from apps.plants.cache import get_catalog_version
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional list/retrieve requests with 304 before serializing.
+    
+    Lists are validated by the catalog version, objects by
+    ``get_object_validators()``. The full path and negotiated format are
+    part of every ETag, so each ``?fields=``/``?cursor=`` variant and the
+    browsable API revalidate separately. Responses are public: catalog
+    data is the same for every user.
+    """
+    
+    def get_list_validators(self):
+        return (get_catalog_version(),), None
+    
+    def get_object_validators(self):
+        """(etag parts, last modified) for the requested object, or (None, None)."""
+        return None, None
+    
+    def _conditional(self, request, validators, render, *args, **kwargs):
+        parts, last_modified = validators
+        etag = None
+        if parts is not None:
+            etag = make_etag(*parts, request.get_full_path(), request.accepted_renderer.format)
+        
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = render(request, *args, **kwargs)
+        return patch_catalog_headers(response, etag, last_modified)
+    
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, self.get_list_validators(), super().list, *args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, self.get_object_validators(), super().retrieve, *args, **kwargs)
@@ -0,0 +1,95 @@
+"""
+Pagination classes for the API app.
+"""
+from django.conf import settings
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from apps.core.pagination import InvalidCursor, cached_keyset_page, is_keyset_ordered
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination over ``(name, id)``.
+    
+    Responses carry ``next``/``previous`` links; ``?include_total=1`` adds a
+    cached ``count``. Querysets not ordered by name (ranked search results)
+    and requests using ``?page=`` are paged by PageNumberPagination instead,
+    in the same envelope: ``count`` is only there when asked for.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    fallback_class = PageNumberPagination
+    
+    def __init__(self):
+        self.fallback = None
+    
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 20
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, page_size))
+        except ValueError:
+            return page_size
+        return max(1, min(requested, self.max_page_size))
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if 'page' in request.query_params or not is_keyset_ordered(queryset):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        
+        try:
+            self.page = cached_keyset_page(
+                queryset, request.query_params.get(self.cursor_query_param), self.get_page_size(request)
+            )
+        except InvalidCursor:
+            raise NotFound("Invalid cursor.")
+        return self.page.object_list
+    
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+    
+    def get_total(self) -> int:
+        if self.fallback is not None:
+            return self.fallback.page.paginator.count
+        return self.page.total
+    
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            next_link, previous_link = self.fallback.get_next_link(), self.fallback.get_previous_link()
+        else:
+            next_link, previous_link = self._link(self.page.next_cursor), self._link(self.page.previous_cursor)
+        
+        body = {'next': next_link, 'previous': previous_link}
+        if self.request.query_params.get('include_total') in ('1', 'true'):
+            body['count'] = self.get_total()
+        body['results'] = data
+        return Response(body)
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+
+def listing_pagination_class():
+    """
+    Pagination class for plant listings, by ``PAGINATION_STYLE``: KeysetPagination
+    for ``'keyset'``, otherwise DRF's DEFAULT_PAGINATION_CLASS (page numbers).
+    """
+    if settings.PAGINATION_STYLE == 'keyset':
+        return KeysetPagination
+    return api_settings.DEFAULT_PAGINATION_CLASS
@@ -0,0 +1,141 @@
+"""
+Serializers for the ZFarming API.
+"""
+from typing import Iterable, List, Optional, Set
+
+from rest_framework import serializers
+
+from apps.plants.models import Plant, PlantCareGuide, PlantCategory
+from apps.plants.search import highlight_html
+
+
+def parse_list_param(value: Optional[str]) -> List[str]:
+    """Split a comma separated query parameter, dropping blanks."""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+class PlantCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PlantCategory
+        fields = ['id', 'name', 'slug', 'description']
+
+
+class PlantCareGuideSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PlantCareGuide
+        exclude = ['id', 'plant', 'created_at', 'updated_at']
+
+
+class SparsePlantSerializer(serializers.ModelSerializer):
+    """
+    Plant serializer with a ``?fields=`` sparse fieldset and ``?expand=``
+    relations.
+
+    ``fields`` and ``expand`` come from the serializer context. The view
+    uses ``columns()`` and ``expansions`` to load only what will be
+    rendered.
+    """
+    image_url = serializers.CharField(source='primary_image', read_only=True)
+    url = serializers.CharField(source='get_absolute_url', read_only=True)
+
+    # Relations clients can opt into: name -> (serializer, related lookup)
+    expansions = {
+        'categories': (lambda: PlantCategorySerializer(many=True, read_only=True), 'categories'),
+        'care_guide': (lambda: PlantCareGuideSerializer(read_only=True, allow_null=True), 'care_guide'),
+    }
+
+    # Model columns behind fields that are not plain model fields
+    field_columns = {
+        'image_url': ['image', 'image_url'],
+        'url': ['slug'],
+    }
+
+    class Meta:
+        model = Plant
+        fields = [
+            'id', 'name', 'scientific_name', 'slug', 'url', 'tagline', 'image_url',
+            'sunlight', 'space', 'care_level', 'is_featured', 'is_beginner_friendly',
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+        for name in self.context.get('expand') or []:
+            factory, _ = self.expansions[name]
+            self.fields[name] = factory()
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Present on ranked search results only
+        if getattr(instance, 'search_rank', None) is not None:
+            data['search_rank'] = instance.search_rank
+            data['search_highlight'] = highlight_html(instance.search_highlight)
+        return data
+
+    @classmethod
+    def available_fields(cls) -> List[str]:
+        return list(cls.Meta.fields)
+
+    @classmethod
+    def validate_params(cls, fields: Iterable[str], expand: Iterable[str]) -> None:
+        """
+        Raises:
+            serializers.ValidationError: for unknown field or expansion names
+        """
+        errors = {}
+        unknown = sorted(set(fields) - set(cls.available_fields()))
+        if unknown:
+            errors['fields'] = [f"Unknown field(s): {', '.join(unknown)}."]
+        unknown = sorted(set(expand) - set(cls.expansions))
+        if unknown:
+            errors['expand'] = [f"Unknown expansion(s): {', '.join(unknown)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    @classmethod
+    def columns(cls, fields: Iterable[str]) -> Set[str]:
+        """Model columns needed to render the given fields."""
+        columns = {'id', 'name'}  # primary key and the pagination key
+        for name in fields or cls.available_fields():
+            columns.update(cls.field_columns.get(name, [name]))
+        return columns
+
+
+class PlantListSerializer(SparsePlantSerializer):
+    """
+    Compact plant representation for list endpoints: no long text fields.
+    """
+
+
+class PlantDetailSerializer(SparsePlantSerializer):
+    """
+    Full plant representation, including descriptions and care details.
+    """
+
+    class Meta(SparsePlantSerializer.Meta):
+        fields = SparsePlantSerializer.Meta.fields + [
+            'description', 'watering_frequency', 'pot_size', 'sunlight_needs',
+            'watering_guide', 'sunlight_guide', 'potting_tips', 'common_issues',
+            'meta_description', 'created_at', 'updated_at',
+        ]
+
+
+class PlantRecommendationSerializer(serializers.ModelSerializer):
+    """
+    Finder recommendation, with display labels and the match score.
+    """
+    image_url = serializers.CharField(source='primary_image', read_only=True)
+    care_level = serializers.CharField(source='care_level_display', read_only=True)
+    sunlight = serializers.CharField(source='sunlight_display', read_only=True)
+    space = serializers.CharField(source='space_display', read_only=True)
+    match_score = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Plant
+        fields = [
+            'id', 'name', 'scientific_name', 'tagline', 'image_url',
+            'care_level', 'sunlight', 'space', 'match_score',
+        ]
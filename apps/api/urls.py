@@ -14,5 +14,6 @@ app_name = 'api'
 urlpatterns = [
     path('', include(router.urls)),
     path('scanner/identify/', views.PlantIdentificationAPIView.as_view(), name='identify'),
+    path('scanner/identify/async/', views.PlantIdentificationAsyncAPIView.as_view(), name='identify_async'),
     path('finder/recommend/', views.PlantRecommendationAPIView.as_view(), name='recommend'),
 ]
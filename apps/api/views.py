@@ -2,59 +2,250 @@
 API views for the ZFarming application.
 """
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from django.db.models import Q
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from asgiref.sync import sync_to_async
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.views import View
+from apps.finder.personalization import personalized_plants
+from apps.finder.recommendations import recommended_plants
+from apps.plants.cache import plant_change_state
 from apps.plants.models import Plant, PlantCategory
+from apps.plants.search import search_plants
+from apps.plants.similarity import similar_plants
+from apps.plants.suggest import suggestion_index
+from apps.scanner.services import get_identification_service, serialize_result
+from .mixins import ConditionalGetMixin
+from .pagination import listing_pagination_class
+from .serializers import (
+    PlantCategorySerializer,
+    PlantDetailSerializer,
+    PlantListSerializer,
+    PlantRecommendationSerializer,
+    parse_list_param,
+)
 
 
-class PlantViewSet(viewsets.ReadOnlyModelViewSet):
+class PlantViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API viewset for plants.
+    
+    Lists use a compact serializer and detail the full one. ``?fields=``
+    picks a subset of fields and only those columns are loaded;
+    ``?expand=categories,care_guide`` adds the related objects. Both
+    answer conditional requests with 304 (see ConditionalGetMixin).
+    Lists are paged by cursor or page number, per ``PAGINATION_STYLE``.
     """
     queryset = Plant.objects.filter(is_active=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
+    lookup_value_regex = r'\d+'
+    
+    @property
+    def pagination_class(self):
+        return listing_pagination_class()
+    
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return PlantDetailSerializer
+        return PlantListSerializer
+    
+    def get_object_validators(self):
+        return plant_change_state(pk=self.kwargs['pk'])
+    
+    def get_sparse_params(self):
+        """Validated (fields, expand) lists from the query string."""
+        if not hasattr(self, '_sparse_params'):
+            fields = parse_list_param(self.request.query_params.get('fields'))
+            expand = parse_list_param(self.request.query_params.get('expand'))
+            self.get_serializer_class().validate_params(fields, expand)
+            self._sparse_params = (fields, expand)
+        return self._sparse_params
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_sparse_params()
+        return context
     
     def get_queryset(self):
-        queryset = Plant.objects.filter(is_active=True)
-        
-        # Search functionality
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(scientific_name__icontains=search)
-            )
+        fields, expand = self.get_sparse_params()
+        queryset = Plant.objects.filter(is_active=True).only(
+            *self.get_serializer_class().columns(fields)
+        )
+        if 'categories' in expand:
+            queryset = queryset.prefetch_related('categories')
+        if 'care_guide' in expand:
+            queryset = queryset.select_related('care_guide')
         
         # Filter by care level
         care_level = self.request.query_params.get('care_level')
         if care_level:
             queryset = queryset.filter(care_level__icontains=care_level)
         
+        # Full-text search, ranked by relevance
+        search = self.request.query_params.get('search')
+        if search:
+            queryset = search_plants(queryset, search)
+        
         return queryset
+    
+    @action(detail=False, methods=['get'], authentication_classes=[], permission_classes=[AllowAny])
+    def suggest(self, request):
+        """
+        Typeahead suggestions from the in-memory prefix index.
+        
+        No authentication or database access, so it is cheap enough to call
+        on every keystroke.
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 8)), 20))
+        except ValueError:
+            limit = 8
+        
+        suggestions = suggestion_index.get().suggest(request.query_params.get('q', ''), limit=limit)
+        response = Response({
+            'results': [suggestion._asdict() for suggestion in suggestions]
+        })
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+    
+    @action(detail=True, methods=['get'])
+    def similar(self, request, pk=None):
+        """Plants most often grown by the same users as this one."""
+        plant = self.get_object()
+        try:
+            limit = min(int(request.query_params.get('limit', 6)), settings.PLANT_SIMILARITY_NEIGHBOURS)
+        except ValueError:
+            limit = 6
+        
+        neighbours = similar_plants(plant, limit=max(limit, 1))
+        results = self.get_serializer(neighbours, many=True).data
+        for result, similar in zip(results, neighbours):
+            result['similarity'] = similar.similarity_score
+        
+        return Response({
+            'plant': plant.id,
+            'similar': results,
+            'count': len(results)
+        })
 
 
-class PlantCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class PlantCategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API viewset for plant categories.
     """
     queryset = PlantCategory.objects.all()
+    serializer_class = PlantCategorySerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    lookup_value_regex = r'\d+'
+    
+    def get_object_validators(self):
+        updated_at = PlantCategory.objects.filter(pk=self.kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None, None
+        return (self.kwargs['pk'], updated_at), updated_at
+
+
+def parse_identification_request(data, files):
+    """
+    Validate an identification upload.
+    
+    Accepts one or more files under ``images`` (or a single ``image``) and an
+    optional ``confidence_threshold``.
+    
+    Returns:
+        (image_files, confidence_threshold, errors)
+    """
+    image_files = files.getlist('images') or files.getlist('image')
+    if not image_files:
+        return [], 0.0, {'images': ['No file was submitted.']}
+    
+    max_images = settings.PLANT_ID_BATCH_MAX_IMAGES
+    if len(image_files) > max_images:
+        return [], 0.0, {'images': [f'At most {max_images} images can be identified per request.']}
+    
+    image_field = forms.ImageField()
+    for image_file in image_files:
+        try:
+            image_field.clean(image_file)
+        except ValidationError as e:
+            return [], 0.0, {'images': [f'{image_file.name}: {message}' for message in e.messages]}
+        image_file.seek(0)
+    
+    try:
+        confidence_threshold = float(data.get('confidence_threshold') or 0.0)
+    except (TypeError, ValueError):
+        return [], 0.0, {'confidence_threshold': ['A valid number is required.']}
+    
+    return image_files, confidence_threshold, None
+
+
+def build_identification_response(image_files, batch_results, confidence_threshold):
+    """
+    Per-image identification results, filtered by confidence.
+    """
+    images = []
+    for image_file, results in zip(image_files, batch_results):
+        suggestions = [
+            serialize_result(result) for result in results
+            if result.get('confidence', 0.0) >= confidence_threshold
+        ]
+        images.append({
+            'image': image_file.name,
+            'suggestions': suggestions,
+            'count': len(suggestions),
+        })
+    
+    return {
+        'results': images,
+        'count': len(images),
+    }
 
 
 class PlantIdentificationAPIView(APIView):
     """
     API endpoint for plant identification.
+    
+    Accepts up to ``PLANT_ID_BATCH_MAX_IMAGES`` images in one request and
+    identifies them concurrently.
     """
     permission_classes = [IsAuthenticatedOrReadOnly]
     
     def post(self, request):
-        # This would integrate with the PlantIdentificationService
-        return Response({
-            'message': 'Plant identification API endpoint',
-            'status': 'coming_soon'
-        })
+        image_files, confidence_threshold, errors = parse_identification_request(request.data, request.FILES)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        batch_results = get_identification_service().identify_plants(image_files)
+        return Response(build_identification_response(image_files, batch_results, confidence_threshold))
+
+
+class PlantIdentificationAsyncAPIView(View):
+    """
+    Native async API endpoint for plant identification (ASGI deployments).
+    
+    DRF views are synchronous, so this is a plain Django view applying the
+    same authenticated-write rule as the rest of the API.
+    """
+    
+    async def post(self, request):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=403
+            )
+        
+        image_files, confidence_threshold, errors = parse_identification_request(request.POST, request.FILES)
+        if errors:
+            return JsonResponse(errors, status=400)
+        
+        batch_results = await get_identification_service().aidentify_plants(image_files)
+        return JsonResponse(build_identification_response(image_files, batch_results, confidence_threshold))
 
 
 class PlantRecommendationAPIView(APIView):
@@ -68,26 +259,12 @@ class PlantRecommendationAPIView(APIView):
         space = request.data.get('space')
         care_level = request.data.get('care_level')
         
-        plants = Plant.objects.filter(
-            sunlight=sunlight,
-            space=space,
-            care_level=care_level,
-            is_active=True
-        )[:6]
+        if request.user.is_authenticated:
+            plants = personalized_plants(request.user, sunlight, space, care_level, limit=6)
+        else:
+            plants = recommended_plants(sunlight, space, care_level, limit=6)
         
-        # Return basic plant data
-        results = []
-        for plant in plants:
-            results.append({
-                'id': plant.id,
-                'name': plant.name,
-                'scientific_name': plant.scientific_name,
-                'tagline': plant.tagline,
-                'image_url': plant.primary_image,
-                'care_level': plant.care_level_display,
-                'sunlight': plant.sunlight_display,
-                'space': plant.space_display,
-            })
+        results = PlantRecommendationSerializer(plants, many=True).data
         
         return Response({
             'plants': results,
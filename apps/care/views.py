@@ -1,12 +1,17 @@
 """
 Views for the care app.
 """
+from django.http import Http404
 from django.views.generic import ListView, DetailView
-from django.db.models import Q
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPaginationMixin
+from apps.plants.cache import get_catalog_version, plant_change_state
+from apps.plants.catalog import get_plant
 from apps.plants.models import Plant
+from apps.plants.search import search_plants
 
 
-class CareHubView(ListView):
+class CareHubView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """
     Care hub page - equivalent to Streamlit care hub page.
     """
@@ -15,26 +20,26 @@ class CareHubView(ListView):
     context_object_name = 'plants'
     paginate_by = 12
     
+    def get_validators(self):
+        return (get_catalog_version(), self.request.get_full_path()), None
+    
     def get_queryset(self):
         queryset = Plant.objects.filter(is_active=True).select_related('care_guide')
         
-        # Search functionality
-        search = self.request.GET.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(scientific_name__icontains=search)
-            )
-        
         # Filter by care level
         care_level = self.request.GET.get('care_level')
         if care_level and care_level != 'All':
             queryset = queryset.filter(care_level__icontains=care_level)
         
+        # Full-text search (care guide text included), ranked by relevance
+        search = self.request.GET.get('search')
+        if search:
+            return search_plants(queryset, search)
+        
         return queryset.order_by('name')
 
 
-class PlantCareDetailView(DetailView):
+class PlantCareDetailView(ConditionalGetMixin, DetailView):
     """
     Detailed plant care guide.
     """
@@ -43,5 +48,14 @@ class PlantCareDetailView(DetailView):
     context_object_name = 'plant'
     slug_field = 'slug'
     
+    def get_validators(self):
+        return plant_change_state(slug=self.kwargs['slug'])
+    
     def get_queryset(self):
         return Plant.objects.filter(is_active=True).select_related('care_guide')
+    
+    def get_object(self, queryset=None):
+        plant = get_plant(self.kwargs['slug'])
+        if plant is None:
+            raise Http404("No plant found matching the query")
+        return plant
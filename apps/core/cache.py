@@ -0,0 +1,125 @@
+"""
+Two-level cache backend for the core app.
+
+``TieredCache`` puts a small in-process LocMem cache (L1) in front of a
+shared cache such as Redis (L2, another ``CACHES`` alias named by
+``LOCATION``). Reads are served from L1 when possible and fall through to
+L2; writes go to L2 and refresh this process's L1 copy.
+
+L1 entries live for at most ``L1_TIMEOUT`` seconds, so a change made by
+another worker is visible here after that delay at the latest. That suits
+the hot, versioned catalog keys this project caches; data that must be
+consistent across workers straight away (sessions) should use the L2 alias
+directly.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    """
+    Cache backend with a bounded per-process L1 in front of a shared L2.
+
+    Options:
+        L1_TIMEOUT: seconds an entry is kept in L1 (0 disables L1)
+        L1_MAX_ENTRIES: size bound of L1
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = location
+        self.l1_timeout = int(options.get('L1_TIMEOUT', 5))
+        self.l1 = LocMemCache(f'tiered-l1-{location}', {
+            'TIMEOUT': self.l1_timeout,
+            'OPTIONS': {'MAX_ENTRIES': int(options.get('L1_MAX_ENTRIES', 1000))},
+        })
+
+    @property
+    def l2(self) -> BaseCache:
+        # Resolved per use: cache handlers are per thread
+        return caches[self._l2_alias]
+
+    def _l1_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return self.l1_timeout
+        return min(timeout, self.l1_timeout)
+
+    def _remember(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        l1_timeout = self._l1_timeout(timeout)
+        if l1_timeout > 0:
+            self.l1.set(key, value, l1_timeout, version=version)
+        else:
+            self.l1.delete(key, version=version)
+
+    def get(self, key, default=None, version=None):
+        value = self.l1.get(key, _MISSING, version=version)
+        if value is not _MISSING:
+            return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._remember(key, value, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.l1.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.l2.get_many(missing, version=version)
+            for key, value in shared.items():
+                self._remember(key, value, version=version)
+            found.update(shared)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.l1.has_key(key, version=version) or self.l2.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._remember(key, value, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version) or []
+        for key, value in data.items():
+            if key not in failed:
+                self._remember(key, value, timeout, version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._remember(key, value, timeout, version=version)
+        else:
+            # Someone else's value wins; fetch it from L2 next time
+            self.l1.delete(key, version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        # The L2 expiry is unknown here, so keep the L1 copy short-lived
+        self._remember(key, value, version=version)
+        return value
+
+    def delete(self, key, version=None):
+        self.l1.delete(key, version=version)
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self.l1.delete_many(keys, version=version)
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
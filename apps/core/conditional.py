@@ -0,0 +1,97 @@
+"""
+Conditional GET and HTTP caching for the core app.
+
+Catalog pages carry an ETag (and Last-Modified where there is one) built
+from ``updated_at`` timestamps or the catalog version, so browsers, nginx
+and CDNs revalidate with a cheap 304 instead of a full re-render.
+Anonymous responses are public; signed-in users get private responses
+whose ETag includes the user.
+"""
+import datetime
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts) -> str:
+    """Quoted ETag from the values that determine a representation."""
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def _timestamp(value: Optional[datetime.datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if not timezone.is_aware(value):
+        value = timezone.make_aware(value, datetime.timezone.utc)
+    return int(value.timestamp())
+
+
+def conditional_response(request, etag: Optional[str], last_modified: Optional[datetime.datetime] = None):
+    """A 304 (or 412) response if the client's copy is current, else None."""
+    return get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+
+
+def patch_catalog_headers(response, etag: Optional[str] = None,
+                          last_modified: Optional[datetime.datetime] = None, public: bool = True):
+    """Set validators and Cache-Control on a catalog response."""
+    if etag:
+        response.headers.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.headers.setdefault('Last-Modified', http_date(_timestamp(last_modified)))
+    if public:
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.CATALOG_HTTP_MAX_AGE,
+            s_maxage=settings.CATALOG_HTTP_SHARED_MAX_AGE,
+        )
+    else:
+        # Stored by the browser only, and revalidated on every use
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def has_pending_messages(request) -> bool:
+    """True if a flash message is waiting to be shown on the next page."""
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+class ConditionalGetMixin:
+    """
+    Generic view mixin that answers conditional GETs before rendering.
+
+    Subclasses implement ``get_validators()``. A matching ``If-None-Match``
+    or ``If-Modified-Since`` gets a 304 without touching the template.
+    Requests with pending flash messages always render, so the messages are
+    shown and consumed.
+    """
+
+    def get_validators(self):
+        """
+        Returns:
+            (etag parts, last modified): parts is a sequence of values that
+            change whenever the page would, or None to skip validation
+        """
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        if has_pending_messages(request):
+            response = super().get(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        parts, last_modified = self.get_validators()
+        public = not request.user.is_authenticated
+        etag = None
+        if parts is not None:
+            etag = make_etag(*parts, None if public else request.user.pk)
+
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return patch_catalog_headers(response, etag, last_modified, public=public)
@@ -0,0 +1,201 @@
+"""
+Keyset (cursor) pagination for the core app.
+
+Pages are addressed by the sort key of their boundary row instead of an
+OFFSET, so the database seeks straight to the page on the ``(name, id)``
+index and page 500 costs the same as page one. Cursors are opaque
+URL-safe tokens; totals are optional and cached.
+"""
+import base64
+import hashlib
+import json
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+# Sort key shared by every keyset-paginated plant listing
+KEYSET_ORDERING = ('name', 'id')
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursors that were tampered with or are malformed."""
+
+
+def encode_cursor(values: List[Any], reverse: bool = False) -> str:
+    payload = json.dumps({'k': values, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str):
+    """Return (key values, reverse) for a cursor token."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, reverse = payload['k'], bool(payload['r'])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor(str(e)) from e
+    if not isinstance(values, list) or len(values) != len(KEYSET_ORDERING):
+        raise InvalidCursor("Cursor does not match the ordering")
+    name, pk = values
+    # bool is an int subclass, but never a valid id
+    if not isinstance(name, str) or not isinstance(pk, int) or isinstance(pk, bool):
+        raise InvalidCursor("Cursor values have the wrong types")
+    return values, reverse
+
+
+def is_keyset_ordered(queryset: QuerySet) -> bool:
+    """True if a queryset is sorted by name (so keyset paging keeps its order)."""
+    ordering = tuple(queryset.query.order_by) or tuple(queryset.model._meta.ordering)
+    return ordering in (('name',), ('name', 'id'), ('name', 'pk'))
+
+
+def _after(values, reverse: bool) -> Q:
+    name, pk = values
+    if reverse:
+        return Q(name__lt=name) | Q(name=name, id__lt=pk)
+    return Q(name__gt=name) | Q(name=name, id__gt=pk)
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated queryset.
+
+    Quacks enough like a Django ``Page`` (``object_list``, ``has_next`` ...)
+    for templates, with cursors instead of page numbers. ``total`` is only
+    counted (and cached) when accessed.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, queryset):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._queryset = queryset
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    @property
+    def total(self) -> int:
+        return cached_count(self._queryset)
+
+
+def keyset_page(queryset: QuerySet, cursor: Optional[str], page_size: int) -> KeysetPage:
+    """
+    Return the page after (or before) ``cursor`` in ``(name, id)`` order.
+
+    Raises:
+        InvalidCursor: if the cursor cannot be decoded
+    """
+    values, reverse = decode_cursor(cursor) if cursor else (None, False)
+    page_queryset = queryset
+    if values is not None:
+        page_queryset = page_queryset.filter(_after(values, reverse))
+    ordering = [f'-{field}' for field in KEYSET_ORDERING] if reverse else list(KEYSET_ORDERING)
+
+    # One extra row tells us whether there is a further page
+    rows = list(page_queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    def key(row):
+        return [getattr(row, field) for field in KEYSET_ORDERING]
+
+    next_cursor = previous_cursor = None
+    if rows and reverse:
+        # Came backwards from a row, so that row is still ahead
+        next_cursor = encode_cursor(key(rows[-1]))
+        if has_more:
+            previous_cursor = encode_cursor(key(rows[0]), reverse=True)
+    elif rows:
+        if has_more:
+            next_cursor = encode_cursor(key(rows[-1]))
+        if values is not None:
+            previous_cursor = encode_cursor(key(rows[0]), reverse=True)
+    return KeysetPage(rows, next_cursor, previous_cursor, queryset)
+
+
+def cached_keyset_page(queryset: QuerySet, cursor: Optional[str], page_size: int) -> KeysetPage:
+    """
+    ``keyset_page()`` with the page rows cached by SQL and catalog version.
+
+    Raises:
+        InvalidCursor: if the cursor cannot be decoded
+    """
+    from apps.plants.cache import cached_catalog
+
+    sql, params = queryset.query.sql_with_params()
+
+    def build():
+        page = keyset_page(queryset, cursor, page_size)
+        return page.object_list, page.next_cursor, page.previous_cursor
+
+    rows, next_cursor, previous_cursor = cached_catalog(
+        ('keyset_page', sql, params, queryset._prefetch_related_lookups, cursor, page_size), build
+    )
+    return KeysetPage(rows, next_cursor, previous_cursor, queryset)
+
+
+def cached_count(queryset: QuerySet, timeout: Optional[int] = None) -> int:
+    """
+    ``queryset.count()``, cached by SQL and catalog version.
+
+    Totals of plant listings only move when the catalog does, so the COUNT
+    runs once per filter combination per catalog version.
+    """
+    from apps.plants.cache import get_catalog_version
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode()).hexdigest()
+    key = f'pagination:count:{get_catalog_version()}:{digest}'
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, timeout=timeout or settings.PAGINATION_COUNT_CACHE_TTL)
+    return total
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that pages name-ordered querysets by cursor.
+
+    Used when ``PAGINATION_STYLE`` is ``'keyset'`` and the queryset is
+    ordered by name. Ranked search results and legacy ``?page=`` links fall
+    back to Django's offset paginator. Keyset pages are cached per catalog
+    version. The template gets ``page_obj`` as a
+    KeysetPage with ``next_cursor``/``previous_cursor`` for ``?cursor=``
+    links and a lazily counted ``total``.
+    """
+    cursor_query_param = 'cursor'
+
+    def use_keyset(self, queryset) -> bool:
+        return (
+            settings.PAGINATION_STYLE == 'keyset'
+            and self.page_kwarg not in self.request.GET
+            and is_keyset_ordered(queryset)
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset(queryset):
+            return super().paginate_queryset(queryset, page_size)
+        try:
+            page = cached_keyset_page(queryset, self.request.GET.get(self.cursor_query_param), page_size)
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return (None, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,279 @@
+"""
+Profile-aware Plant Finder recommendations.
+
+Signed-in users are scored against their gardening profile as well as the
+finder answers: ``sunlight_hours``, ``available_space`` and
+``preferred_care_level`` (or ``experience_level``) fill in any answer that
+was not given, and the outcomes of the user's collection and favorites are
+turned into a per-category affinity that nudges the ranking towards the
+kinds of plants they have done well with.
+
+Ranked results are cached per user and invalidated by the accounts signals
+whenever the profile, collection or favorites change.
+"""
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.plants.cache import CatalogIndex, get_catalog_version
+from apps.plants.catalog import plants_in_bulk
+from apps.plants.models import Plant, PlantCategory
+from .recommendations import (
+    CARE_LEVELS,
+    SPACE_LEVELS,
+    SUNLIGHT_LEVELS,
+    WEIGHTS,
+    closeness,
+)
+
+# User.available_space -> index into SPACE_LEVELS
+SPACE_FROM_PROFILE = {
+    'windowsill': 0,
+    'indoor_only': 2,
+    'small_balcony': 2,
+    'large_balcony': 3,
+    'garden': 3,
+}
+
+# User.experience_level -> index into CARE_LEVELS
+CARE_FROM_EXPERIENCE = {
+    'beginner': 0,
+    'some_experience': 1,
+    'experienced': 2,
+}
+
+# How much the category affinity (in [-1, 1]) can move a plant's score
+AFFINITY_WEIGHT = 0.2
+
+# Signal strength of each collection outcome; ratings map 1..5 to -1..1
+COLLECTION_STATUS_SIGNAL = {
+    'want_to_grow': 0.5,
+    'currently_growing': 0.5,
+    'successfully_grown': 1.0,
+    'had_issues': -1.0,
+}
+FAVORITE_SIGNAL = 1.0
+
+# Plants the user already grows (or gave up on) are not recommended again
+EXCLUDED_STATUSES = ('currently_growing', 'successfully_grown', 'had_issues')
+
+
+def sunlight_level_from_hours(hours: Optional[int]) -> Optional[int]:
+    """Map hours of direct sun to an index into SUNLIGHT_LEVELS."""
+    if hours is None:
+        return None
+    if hours >= 6:
+        return 2
+    if hours >= 2:
+        return 1
+    return 0
+
+
+class CatalogFeatures:
+    """
+    Attribute matrix of all active plants, rebuilt per catalog version.
+    """
+
+    def __init__(self, rows, category_ids: List[int], plant_categories: Dict[int, List[int]]):
+        self.pks = np.array([row[0] for row in rows], dtype=np.int64)
+        self.sunlight = np.array([SUNLIGHT_LEVELS.index(row[1]) if row[1] in SUNLIGHT_LEVELS else -10 for row in rows])
+        self.space = np.array([SPACE_LEVELS.index(row[2]) if row[2] in SPACE_LEVELS else -10 for row in rows])
+        self.care = np.array([CARE_LEVELS.index(row[3]) if row[3] in CARE_LEVELS else -10 for row in rows])
+        self.position = {pk: i for i, pk in enumerate(self.pks.tolist())}
+
+        # Row-normalised plant x category membership matrix
+        self.category_index = {pk: i for i, pk in enumerate(category_ids)}
+        self.categories = np.zeros((len(rows), len(category_ids)))
+        for plant_pk, category_pks in plant_categories.items():
+            row = self.position.get(plant_pk)
+            if row is not None:
+                for category_pk in category_pks:
+                    self.categories[row, self.category_index[category_pk]] = 1.0
+        counts = self.categories.sum(axis=1, keepdims=True)
+        np.divide(self.categories, counts, out=self.categories, where=counts > 0)
+
+    @classmethod
+    def build(cls) -> 'CatalogFeatures':
+        rows = list(
+            Plant.objects.filter(is_active=True).order_by('name', 'pk').values_list(
+                'pk', 'sunlight', 'space', 'care_level'
+            )
+        )
+        category_ids = list(PlantCategory.objects.order_by('pk').values_list('pk', flat=True))
+        plant_categories: Dict[int, List[int]] = {}
+        memberships = Plant.categories.through.objects.filter(plant__is_active=True).values_list(
+            'plant_id', 'plantcategory_id'
+        )
+        for plant_pk, category_pk in memberships:
+            plant_categories.setdefault(plant_pk, []).append(category_pk)
+        return cls(rows, category_ids, plant_categories)
+
+    def category_vector(self, plant_pk: int) -> Optional[np.ndarray]:
+        row = self.position.get(plant_pk)
+        return None if row is None else self.categories[row]
+
+
+catalog_features: CatalogIndex[CatalogFeatures] = CatalogIndex(CatalogFeatures.build)
+
+
+class UserProfileVector:
+    """
+    What the recommender knows about one user.
+
+    ``sunlight``, ``space`` and ``care`` are ordinal indexes (or None when
+    the profile does not say), ``affinity`` is a weight in [-1, 1] per
+    catalog category and ``excluded`` holds plants not to recommend again.
+    """
+
+    def __init__(self, sunlight, space, care, affinity: np.ndarray, excluded: List[int]):
+        self.sunlight = sunlight
+        self.space = space
+        self.care = care
+        self.affinity = affinity
+        self.excluded = excluded
+
+    @classmethod
+    def for_user(cls, user, features: CatalogFeatures) -> 'UserProfileVector':
+        if user.preferred_care_level in CARE_LEVELS:
+            care = CARE_LEVELS.index(user.preferred_care_level)
+        else:
+            care = CARE_FROM_EXPERIENCE.get(user.experience_level)
+
+        # Sum of outcome signals per category, averaged over the plants seen
+        totals = np.zeros(features.categories.shape[1])
+        seen = 0
+        excluded = []
+        collection = user.plant_collection.values_list('plant_id', 'status', 'rating', 'would_recommend')
+        for plant_pk, status, rating, would_recommend in collection:
+            if status in EXCLUDED_STATUSES:
+                excluded.append(plant_pk)
+            vector = features.category_vector(plant_pk)
+            if vector is None:
+                continue
+            signals = [COLLECTION_STATUS_SIGNAL.get(status, 0.0)]
+            if rating:
+                signals.append((min(rating, 5) - 3) / 2)
+            if would_recommend is not None:
+                signals.append(1.0 if would_recommend else -1.0)
+            totals += vector * (sum(signals) / len(signals))
+            seen += 1
+
+        for plant_pk in user.favorite_plants.values_list('pk', flat=True):
+            vector = features.category_vector(plant_pk)
+            if vector is not None:
+                totals += vector * FAVORITE_SIGNAL
+                seen += 1
+
+        affinity = np.clip(totals / seen, -1.0, 1.0) if seen else totals
+        return cls(
+            sunlight=sunlight_level_from_hours(user.sunlight_hours),
+            space=SPACE_FROM_PROFILE.get(user.available_space),
+            care=care,
+            affinity=affinity,
+            excluded=excluded,
+        )
+
+
+def score_catalog(features: CatalogFeatures, profile: UserProfileVector, sunlight, space, care) -> np.ndarray:
+    """
+    Score every plant for the given ordinal answers and profile affinity.
+
+    Dimensions with no answer are left out and the remaining weights are
+    rescaled, so a partial profile still ranks on what it does know.
+    """
+    scores = np.zeros(len(features.pks))
+    total_weight = 0.0
+    for wanted, levels, values, weight, asymmetric in (
+        (sunlight, SUNLIGHT_LEVELS, features.sunlight, WEIGHTS['sunlight'], False),
+        (space, SPACE_LEVELS, features.space, WEIGHTS['space'], True),
+        (care, CARE_LEVELS, features.care, WEIGHTS['care_level'], True),
+    ):
+        if wanted is None:
+            continue
+        scores += weight * closeness(values, wanted, len(levels), asymmetric)
+        total_weight += weight
+    if total_weight:
+        scores /= total_weight
+
+    if features.categories.size:
+        scores += AFFINITY_WEIGHT * (features.categories @ profile.affinity)
+    return scores
+
+
+def _user_version_key(user_pk: int) -> str:
+    return f'finder:user:{user_pk}:version'
+
+
+def get_user_version(user_pk: int) -> int:
+    version = cache.get(_user_version_key(user_pk))
+    if version is None:
+        version = int(time.time() * 1000)
+        cache.add(_user_version_key(user_pk), version, timeout=None)
+        version = cache.get(_user_version_key(user_pk), version)
+    return version
+
+
+def invalidate_user_recommendations(user_pk: int) -> None:
+    """Drop every cached ranking for a user."""
+    cache.set(_user_version_key(user_pk), int(time.time() * 1000), timeout=None)
+
+
+def _level(value, levels) -> Optional[int]:
+    return levels.index(value) if value in levels else None
+
+
+def personalized_recommend(user, sunlight=None, space=None, care_level=None, limit: int = 6) -> List[Tuple[int, float]]:
+    """
+    Return the best (plant pk, score) pairs for a signed-in user.
+
+    Explicit finder answers take precedence over the profile; unanswered
+    dimensions fall back to it.
+    """
+    answers = (_level(sunlight, SUNLIGHT_LEVELS), _level(space, SPACE_LEVELS), _level(care_level, CARE_LEVELS))
+    signature = hashlib.md5(repr((answers, limit)).encode()).hexdigest()[:12]
+    key = f'finder:personal:{user.pk}:{get_user_version(user.pk)}:{get_catalog_version()}:{signature}'
+
+    ranked = cache.get(key)
+    if ranked is None:
+        features = catalog_features.get()
+        profile = UserProfileVector.for_user(user, features)
+        wanted = [
+            answer if answer is not None else fallback
+            for answer, fallback in zip(answers, (profile.sunlight, profile.space, profile.care))
+        ]
+
+        ranked = []
+        # Nothing answered and nothing learned yet: no basis for a ranking
+        has_signal = any(w is not None for w in wanted) or profile.affinity.any()
+        if len(features.pks) and has_signal:
+            scores = score_catalog(features, profile, *wanted)
+            excluded = set(profile.excluded)
+            for i in np.argsort(-scores, kind='stable'):
+                pk = int(features.pks[i])
+                if pk in excluded:
+                    continue
+                ranked.append((pk, round(float(scores[i]), 4)))
+                if len(ranked) == limit:
+                    break
+        cache.set(key, ranked, timeout=settings.FINDER_PERSONALIZED_CACHE_TTL)
+    return ranked
+
+
+def personalized_plants(user, sunlight=None, space=None, care_level=None, limit: int = 6) -> List[Plant]:
+    """
+    Personalized recommendations in ranked order, annotated with ``match_score``.
+    """
+    ranked = personalized_recommend(user, sunlight, space, care_level, limit)
+    plants = plants_in_bulk(pk for pk, _ in ranked)
+
+    results = []
+    for pk, score in ranked:
+        plant = plants.get(pk)
+        if plant is not None:
+            plant.match_score = score
+            results.append(plant)
+    return results
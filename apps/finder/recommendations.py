@@ -0,0 +1,120 @@
+"""
+Plant Finder recommendation scoring.
+
+Every finder answer is a combination of three ordinal preferences (light,
+container size, care difficulty), so there are only
+3 x 4 x 3 = 36 possible questions. Rankings for all of them are computed
+once per catalog version and shared through the cache, which turns every
+finder request into a table lookup.
+"""
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from apps.plants.cache import CatalogIndex, cached_catalog
+from apps.plants.catalog import plants_in_bulk
+from apps.plants.models import Plant
+
+SUNLIGHT_LEVELS = [value for value, _ in Plant.SUNLIGHT_CHOICES]
+SPACE_LEVELS = [value for value, _ in Plant.SPACE_CHOICES]
+CARE_LEVELS = [value for value, _ in Plant.CARE_LEVEL_CHOICES]
+
+# Relative importance of each dimension; a plant matching on all three scores 1.0
+WEIGHTS = {
+    'sunlight': 0.4,
+    'space': 0.3,
+    'care_level': 0.3,
+}
+
+# Share of the distance penalty applied when a plant asks for *less* than the
+# user offers (an easy plant for an expert, a small pot on a big balcony)
+UNDERSHOOT_PENALTY = 0.5
+
+RecommendationTable = Dict[Tuple[int, int, int], List[Tuple[int, float]]]
+
+
+def closeness(plant_levels: np.ndarray, wanted: int, n_levels: int, asymmetric: bool) -> np.ndarray:
+    """Similarity in [0, 1] between each plant's level and the wanted level."""
+    distance = (plant_levels - wanted) / (n_levels - 1)
+    if asymmetric:
+        distance = np.where(distance < 0, -distance * UNDERSHOOT_PENALTY, distance)
+    return 1.0 - np.abs(distance)
+
+
+def build_recommendation_table(size: Optional[int] = None) -> RecommendationTable:
+    """
+    Rank all active plants for every preference combination.
+
+    Returns a mapping of (sunlight, space, care level) indexes to the top
+    ``size`` (plant pk, score) pairs, best first. Ties are broken by the
+    catalog's name ordering.
+    """
+    size = size or settings.FINDER_RECOMMENDATION_TABLE_SIZE
+    rows = list(
+        Plant.objects.filter(is_active=True).order_by('name', 'pk').values_list(
+            'pk', 'sunlight', 'space', 'care_level'
+        )
+    )
+    if not rows:
+        return {}
+
+    pks = np.array([row[0] for row in rows])
+    sunlight = np.array([SUNLIGHT_LEVELS.index(row[1]) if row[1] in SUNLIGHT_LEVELS else -10 for row in rows])
+    space = np.array([SPACE_LEVELS.index(row[2]) if row[2] in SPACE_LEVELS else -10 for row in rows])
+    care = np.array([CARE_LEVELS.index(row[3]) if row[3] in CARE_LEVELS else -10 for row in rows])
+
+    sunlight_scores = [closeness(sunlight, i, len(SUNLIGHT_LEVELS), False) for i in range(len(SUNLIGHT_LEVELS))]
+    space_scores = [closeness(space, i, len(SPACE_LEVELS), True) for i in range(len(SPACE_LEVELS))]
+    care_scores = [closeness(care, i, len(CARE_LEVELS), True) for i in range(len(CARE_LEVELS))]
+
+    table = {}
+    for s, sp, c in itertools.product(range(len(SUNLIGHT_LEVELS)), range(len(SPACE_LEVELS)), range(len(CARE_LEVELS))):
+        scores = (
+            WEIGHTS['sunlight'] * sunlight_scores[s]
+            + WEIGHTS['space'] * space_scores[sp]
+            + WEIGHTS['care_level'] * care_scores[c]
+        )
+        # Stable sort keeps name order among equal scores
+        top = np.argsort(-scores, kind='stable')[:size]
+        table[(s, sp, c)] = [(int(pks[i]), round(float(scores[i]), 4)) for i in top]
+    return table
+
+
+def _load_table() -> RecommendationTable:
+    # Share one computation per catalog version across worker processes;
+    # tables of old versions expire with the other catalog reads
+    return cached_catalog(('finder:recommendations',), build_recommendation_table)
+
+
+recommendation_table: CatalogIndex[RecommendationTable] = CatalogIndex(_load_table)
+
+
+def recommend(sunlight: str, space: str, care_level: str, limit: int = 6) -> List[Tuple[int, float]]:
+    """
+    Return the best (plant pk, score) pairs for a set of finder answers.
+
+    Unknown answers yield an empty list.
+    """
+    try:
+        key = (SUNLIGHT_LEVELS.index(sunlight), SPACE_LEVELS.index(space), CARE_LEVELS.index(care_level))
+    except ValueError:
+        return []
+    return recommendation_table.get().get(key, [])[:limit]
+
+
+def recommended_plants(sunlight: str, space: str, care_level: str, limit: int = 6) -> List[Plant]:
+    """
+    Recommended plants in ranked order, each annotated with ``match_score``.
+    """
+    ranked = recommend(sunlight, space, care_level, limit)
+    plants = plants_in_bulk(pk for pk, _ in ranked)
+
+    results = []
+    for pk, score in ranked:
+        plant = plants.get(pk)
+        if plant is not None:
+            plant.match_score = score
+            results.append(plant)
+    return results
@@ -5,6 +5,13 @@ from django.views.generic import TemplateView, FormView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django import forms
 from apps.plants.models import Plant
+from .personalization import (
+    CARE_FROM_EXPERIENCE,
+    SPACE_FROM_PROFILE,
+    personalized_plants,
+    sunlight_level_from_hours,
+)
+from .recommendations import CARE_LEVELS, SPACE_LEVELS, SUNLIGHT_LEVELS, recommended_plants
 
 
 class PlantFinderForm(forms.Form):
@@ -33,6 +40,24 @@ class PlantFinderView(FormView):
     form_class = PlantFinderForm
     success_url = '/finder/results/'
     
+    def get_initial(self):
+        # Pre-fill the answers a signed-in user's profile already gives
+        initial = super().get_initial()
+        user = self.request.user
+        if user.is_authenticated:
+            sunlight = sunlight_level_from_hours(user.sunlight_hours)
+            space = SPACE_FROM_PROFILE.get(user.available_space)
+            care = CARE_FROM_EXPERIENCE.get(user.experience_level)
+            if sunlight is not None:
+                initial['sunlight'] = SUNLIGHT_LEVELS[sunlight]
+            if space is not None:
+                initial['space'] = SPACE_LEVELS[space]
+            if user.preferred_care_level:
+                initial['care_level'] = user.preferred_care_level
+            elif care is not None:
+                initial['care_level'] = CARE_LEVELS[care]
+        return initial
+    
     def form_valid(self, form):
         # Store form data in session for results page
         self.request.session['finder_preferences'] = form.cleaned_data
@@ -51,21 +76,25 @@ class PlantRecommendationsView(TemplateView):
         # Get preferences from session
         preferences = self.request.session.get('finder_preferences', {})
         
-        if preferences:
-            # Filter plants based on preferences
-            plants = Plant.objects.filter(
-                sunlight=preferences.get('sunlight'),
-                space=preferences.get('space'),
-                care_level=preferences.get('care_level'),
-                is_active=True
-            )[:6]  # Limit to 6 results
-            
-            # If no exact matches, show similar plants
-            if not plants:
-                plants = Plant.objects.filter(
-                    care_level=preferences.get('care_level'),
-                    is_active=True
-                )[:6]
+        if self.request.user.is_authenticated:
+            # Profile and collection history fill in and refine the answers
+            context['plants'] = personalized_plants(
+                self.request.user,
+                preferences.get('sunlight'),
+                preferences.get('space'),
+                preferences.get('care_level'),
+                limit=6
+            )
+            context['preferences'] = preferences
+            context['personalized'] = True
+        elif preferences:
+            # Rank plants by closeness to the preferences (precomputed table)
+            plants = recommended_plants(
+                preferences.get('sunlight'),
+                preferences.get('space'),
+                preferences.get('care_level'),
+                limit=6
+            )
             
             context['plants'] = plants
             context['preferences'] = preferences
@@ -2,8 +2,10 @@
 Admin configuration for the plants app.
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import PlantCategory, Plant, PlantCareGuide, PlantImage
+from .cache import bump_catalog_version
+from .models import PlantCategory, Plant, PlantCareGuide, PlantImage, PlantSimilarity
 
 
 @admin.register(PlantCategory)
@@ -69,10 +71,11 @@ class PlantAdmin(admin.ModelAdmin):
     inlines = [PlantCareGuideInline, PlantImageInline]
     
     def image_preview(self, obj):
-        if obj.primary_image:
+        image = obj.primary_image
+        if image:
             return format_html(
-                '<img src="{}" width="50" height="50" style="object-fit: cover;" />',
-                obj.primary_image
+                '<img src="{}" srcset="{}" width="50" height="50" style="object-fit: cover;" />',
+                image.rendition('thumbnail'), image.srcset('thumbnail')
             )
         return "No image"
     image_preview.short_description = "Image"
@@ -88,22 +91,26 @@ class PlantAdmin(admin.ModelAdmin):
     actions = ['make_featured', 'remove_featured', 'activate', 'deactivate']
     
     def make_featured(self, request, queryset):
-        queryset.update(is_featured=True)
+        queryset.update(is_featured=True, updated_at=timezone.now())
+        bump_catalog_version()  # update() bypasses model signals
         self.message_user(request, f"{queryset.count()} plants marked as featured.")
     make_featured.short_description = "Mark selected plants as featured"
     
     def remove_featured(self, request, queryset):
-        queryset.update(is_featured=False)
+        queryset.update(is_featured=False, updated_at=timezone.now())
+        bump_catalog_version()
         self.message_user(request, f"{queryset.count()} plants removed from featured.")
     remove_featured.short_description = "Remove selected plants from featured"
     
     def activate(self, request, queryset):
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_catalog_version()
         self.message_user(request, f"{queryset.count()} plants activated.")
     activate.short_description = "Activate selected plants"
     
     def deactivate(self, request, queryset):
-        queryset.update(is_active=False)
+        queryset.update(is_active=False, updated_at=timezone.now())
+        bump_catalog_version()
         self.message_user(request, f"{queryset.count()} plants deactivated.")
     deactivate.short_description = "Deactivate selected plants"
 
@@ -147,9 +154,18 @@ class PlantImageAdmin(admin.ModelAdmin):
     
     def image_preview(self, obj):
         if obj.image:
+            image = obj.image_source
             return format_html(
-                '<img src="{}" width="50" height="50" style="object-fit: cover;" />',
-                obj.image.url
+                '<img src="{}" srcset="{}" width="50" height="50" style="object-fit: cover;" />',
+                image.rendition('thumbnail'), image.srcset('thumbnail')
             )
         return "No image"
     image_preview.short_description = "Preview"
+
+
+@admin.register(PlantSimilarity)
+class PlantSimilarityAdmin(admin.ModelAdmin):
+    list_display = ['plant', 'rank', 'similar_plant', 'score', 'watermark']
+    search_fields = ['plant__name', 'similar_plant__name']
+    list_select_related = ['plant', 'similar_plant']
+    raw_id_fields = ['plant', 'similar_plant']
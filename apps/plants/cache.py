@@ -0,0 +1,135 @@
+"""
+Catalog cache versioning for the plants app.
+
+The plant catalog changes rarely (admin edits, imports), so derived data such
+as lookup indexes is built once and reused until the catalog version moves.
+The version lives in the shared cache so every worker process sees a bump.
+Shared cache entries (``cached_catalog``) embed the version in their key:
+a bump makes them unreachable and they simply expire.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Generic, Optional, Sequence, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+T = TypeVar('T')
+
+_MISSING = object()
+
+
+def _new_version() -> int:
+    # Time-based so a version recreated after eviction never repeats an old one
+    return int(time.time() * 1000)
+
+
+def get_catalog_version() -> int:
+    """Return the current catalog version."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version() -> int:
+    """Invalidate everything derived from the catalog."""
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        version = _new_version()
+        cache.set(CATALOG_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def catalog_cache_key(parts: Sequence) -> str:
+    digest = hashlib.md5(repr(tuple(parts)).encode()).hexdigest()
+    return f'catalog:{get_catalog_version()}:{digest}'
+
+
+def cached_catalog(parts: Sequence, builder: Callable[[], T], timeout: Optional[int] = None) -> T:
+    """
+    ``builder()`` cached in the shared cache under the current catalog version.
+
+    ``parts`` identify the value (a name plus its arguments). None results
+    are cached too, so missing objects do not hit the database either.
+    """
+    key = catalog_cache_key(parts)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = builder()
+        cache.set(key, value, timeout=timeout or settings.CATALOG_CACHE_TTL)
+    return value
+
+
+class CatalogIndex(Generic[T]):
+    """
+    Process-local value rebuilt whenever the catalog version changes.
+
+    Reads cost one cache lookup for the version check; the builder only
+    touches the database after an invalidation.
+    """
+
+    def __init__(self, builder: Callable[[], T]):
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._version: Optional[int] = None
+
+    def get(self) -> T:
+        version = get_catalog_version()
+        if self._version == version:
+            return self._value
+
+        with self._lock:
+            if self._version != version:
+                self._value = self.builder()
+                self._version = version
+            return self._value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._value = None
+            self._version = None
+
+
+def plant_change_state(**lookup):
+    """
+    ``(etag parts, last modified)`` for one active plant's pages, or
+    ``(None, None)`` if there is no such plant.
+
+    One query over the timestamps of everything a plant page shows: the
+    plant, its care guide, categories and gallery, and its stored similar
+    plants. Cached per catalog version.
+    """
+    state = cached_catalog(('plant_change_state', sorted(lookup.items())), lambda: _plant_change_state(lookup))
+    if state is None:
+        return None, None
+    last_modified = max(value for value in state[1:5] if value is not None)
+    return state, last_modified
+
+
+def _plant_change_state(lookup):
+    from django.db.models import Count, F, Max
+
+    from .models import Plant
+
+    return (
+        Plant.objects.filter(is_active=True, **lookup)
+        .annotate(
+            care_guide_updated=F('care_guide__updated_at'),
+            categories_updated=Max('categories__updated_at'),
+            images_added=Max('additional_images__created_at'),
+            images=Count('additional_images', distinct=True),
+            similar_updated=Max('similarities__watermark'),
+        )
+        .values_list(
+            'pk', 'updated_at', 'care_guide_updated', 'categories_updated',
+            'images_added', 'images', 'similar_updated',
+        )
+        .first()
+    )
@@ -0,0 +1,46 @@
+"""
+Cached catalog reads for the plants app.
+
+Hot catalog queries, cached in the shared cache per catalog version (see
+``cache.cached_catalog``). Any catalog write bumps the version, so in steady
+state these never touch the database. Returned model instances are fresh
+copies and may be annotated by callers.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from .cache import cached_catalog
+from .models import Plant, PlantCategory
+
+
+def get_plant(slug: str) -> Optional[Plant]:
+    """Active plant with its care guide, categories and gallery loaded."""
+    return cached_catalog(
+        ('plant', slug),
+        lambda: (
+            Plant.objects.filter(is_active=True, slug=slug)
+            .select_related('care_guide')
+            .prefetch_related('categories', 'additional_images')
+            .first()
+        ),
+    )
+
+
+def plants_in_bulk(pks: Iterable[int]) -> Dict[int, Plant]:
+    """``Plant.objects.in_bulk()`` for a set of plant ids."""
+    pks = sorted(set(pks))
+    if not pks:
+        return {}
+    return cached_catalog(('plants_in_bulk', pks), lambda: Plant.objects.in_bulk(pks))
+
+
+def get_categories() -> List[PlantCategory]:
+    return cached_catalog(('categories',), lambda: list(PlantCategory.objects.all()))
+
+
+def get_category(slug: str) -> Optional[PlantCategory]:
+    return cached_catalog(('category', slug), lambda: PlantCategory.objects.filter(slug=slug).first())
+
+
+def sample_plants(count: int = 3) -> List[Plant]:
+    """A few active plants, for demo and placeholder results."""
+    return cached_catalog(('sample_plants', count), lambda: list(Plant.objects.filter(is_active=True)[:count]))
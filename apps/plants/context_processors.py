@@ -0,0 +1,20 @@
+"""
+Context processors for the plants app.
+"""
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .cache import get_catalog_version
+
+
+def catalog(request):
+    """
+    Catalog version for template fragment caching, e.g.
+    ``{% cache catalog_cache_ttl 'plant_card' plant.pk catalog_version %}``.
+
+    Resolved lazily, so pages that do not cache fragments pay nothing.
+    """
+    return {
+        'catalog_version': SimpleLazyObject(get_catalog_version),
+        'catalog_cache_ttl': settings.CATALOG_CACHE_TTL,
+    }
@@ -0,0 +1,126 @@
+"""
+Faceted filter counts for the plant list.
+
+Counts for every sunlight, space, care level and category value are
+computed with a single aggregate query: one ``COUNT(DISTINCT id) FILTER``
+per facet value. Each facet is counted under the *other* active filters
+(but not its own), so the counts show what selecting an alternative would
+return. Results are cached by normalized filter signature and catalog
+version.
+"""
+import hashlib
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+
+from .cache import CatalogIndex, get_catalog_version
+from .models import Plant, PlantCategory
+from .search import search_plants
+
+FACETS = ['sunlight', 'space', 'care_level', 'category']
+
+FacetCounts = Dict[str, List[Dict]]
+
+
+def _choice_label(value: str) -> str:
+    # Same cleanup as Plant.sunlight_display and friends
+    return value.split('(')[0].strip()
+
+
+category_choices: CatalogIndex[list] = CatalogIndex(
+    lambda: [(slug, name) for slug, name in PlantCategory.objects.order_by('name').values_list('slug', 'name')]
+)
+
+
+def facet_values(facet: str) -> List[tuple]:
+    """(value, label) pairs for a facet."""
+    if facet == 'sunlight':
+        return [(value, _choice_label(value)) for value, _ in Plant.SUNLIGHT_CHOICES]
+    if facet == 'space':
+        return [(value, _choice_label(value)) for value, _ in Plant.SPACE_CHOICES]
+    if facet == 'care_level':
+        return [(value, _choice_label(value)) for value, _ in Plant.CARE_LEVEL_CHOICES]
+    return category_choices.get()
+
+
+def facet_filters(params) -> Dict[str, str]:
+    """Normalize request parameters to the active facet filters."""
+    filters = {}
+    for facet in FACETS:
+        value = (params.get(facet) or '').strip()
+        if value and value != 'All':
+            filters[facet] = value
+    return filters
+
+
+def facet_q(facet: str, value: str) -> Q:
+    """Filter condition for one facet value."""
+    if facet == 'care_level':
+        # Matches the list's historic "Beginner" style partial values
+        return Q(care_level__icontains=value)
+    if facet == 'category':
+        return Q(categories__slug=value)
+    return Q(**{facet: value})
+
+
+def apply_facet_filters(queryset: QuerySet, filters: Dict[str, str]) -> QuerySet:
+    for facet, value in filters.items():
+        queryset = queryset.filter(facet_q(facet, value))
+    return queryset
+
+
+def _is_selected(facet: str, value: str, filters: Dict[str, str]) -> bool:
+    selected = filters.get(facet)
+    if not selected:
+        return False
+    if facet == 'care_level':
+        return selected.casefold() in value.casefold()
+    return selected == value
+
+
+def compute_facet_counts(queryset: QuerySet, filters: Dict[str, str]) -> FacetCounts:
+    """Count every facet value over ``queryset`` in one aggregate query."""
+    aggregates = {}
+    labels = {}
+    for facet in FACETS:
+        others = Q()
+        for other, value in filters.items():
+            if other != facet:
+                others &= facet_q(other, value)
+        labels[facet] = facet_values(facet)
+        for i, (value, _) in enumerate(labels[facet]):
+            aggregates[f'{facet}__{i}'] = Count('pk', filter=facet_q(facet, value) & others, distinct=True)
+
+    totals = queryset.order_by().aggregate(**aggregates) if aggregates else {}
+    return {
+        facet: [
+            {
+                'value': value,
+                'label': label,
+                'count': totals.get(f'{facet}__{i}', 0),
+                'selected': _is_selected(facet, value, filters),
+            }
+            for i, (value, label) in enumerate(labels[facet])
+        ]
+        for facet in FACETS
+    }
+
+
+def plant_facets(filters: Dict[str, str], search: str = '') -> FacetCounts:
+    """
+    Facet counts for the active plant list under the given filters and search.
+    """
+    search = ' '.join((search or '').split()).casefold()
+    signature = repr((sorted(filters.items()), search))
+    key = f'plants:facets:{get_catalog_version()}:{hashlib.md5(signature.encode()).hexdigest()}'
+
+    counts = cache.get(key)
+    if counts is None:
+        queryset = Plant.objects.filter(is_active=True)
+        if search:
+            queryset = search_plants(queryset, search)
+        counts = compute_facet_counts(queryset, filters)
+        cache.set(key, counts, timeout=settings.PLANT_FACET_CACHE_TTL)
+    return counts
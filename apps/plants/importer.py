@@ -0,0 +1,561 @@
+"""
+Bulk catalog import for the plants app.
+
+The import is a pipeline: rows are parsed from the CSV and chunked, each
+chunk is enriched (the derived fields, slug, care guide text and
+categories; see ``enrich_row``) on a pool of worker processes, and a single
+writer stores the enriched chunks in order. Each chunk is one transaction
+with a fixed handful of queries, however many rows it holds: an existing
+plant lookup, a bulk insert and a bulk update, one bulk insert each for the
+category links and care guides, and a search index update. Model signals
+are bypassed, so the catalog version is bumped once at the end (and not at
+all if nothing changed).
+
+Every plant stores a hash of its source row, so re-imports only rewrite
+plants whose row changed. Sync mode also deactivates plants that are no
+longer in the source.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+import django
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .cache import bump_catalog_version
+from .models import Plant, PlantCareGuide, PlantCategory
+from .search import get_search_backend
+
+logger = logging.getLogger(__name__)
+
+
+class PlantRow(NamedTuple):
+    """A row of data/plants.csv; fields in file order."""
+    name: str
+    scientific_name: str
+    sunlight: str
+    space: str
+    care_level: str
+    image_url: str
+    tagline: str
+    description: str
+    watering_frequency: str
+    pot_size: str
+    sunlight_needs: str
+    watering_guide: str
+    sunlight_guide: str
+    potting_tips: str
+    common_issues: str
+    plant_id: str
+
+
+# Columns of data/plants.csv, in file order
+CSV_COLUMNS = list(PlantRow._fields)
+
+# Plant fields taken from the CSV (everything but the plant_id key)
+DATA_FIELDS = [column for column in CSV_COLUMNS if column != 'plant_id']
+
+# Fields rewritten when an existing plant's row changed
+UPDATE_FIELDS = DATA_FIELDS + ['is_beginner_friendly', 'meta_description', 'content_hash', 'is_active', 'updated_at']
+
+# Care guide fields derived from the row (see enrich_row), rewritten along with it
+CARE_GUIDE_FIELDS = [
+    'fertilizing_guide', 'pruning_guide', 'repotting_guide', 'pest_control',
+    'disease_prevention', 'pro_tips', 'common_mistakes',
+]
+
+DEFAULT_CATEGORIES = {
+    'Herbs': 'Culinary and aromatic herbs perfect for cooking',
+    'Flowers': 'Beautiful flowering plants for decoration',
+    'Vegetables': 'Edible vegetables you can grow at home',
+    'Succulents': 'Low-maintenance plants that store water',
+    'Air Purifying': 'Plants that help clean indoor air',
+}
+
+# Categories of the bundled plants, by plant_id
+CATEGORY_MAPPING = {
+    'mint': ['Herbs'],
+    'basil': ['Herbs'],
+    'parsley': ['Herbs'],
+    'cilantro': ['Herbs'],
+    'rosemary': ['Herbs'],
+    'lavender': ['Herbs'],
+    'marigold': ['Flowers'],
+    'peace_lily': ['Flowers', 'Air Purifying'],
+    'snake_plant': ['Succulents', 'Air Purifying'],
+    'spider_plant': ['Air Purifying'],
+    'aloe_vera': ['Succulents'],
+    'cherry_tomatoes': ['Vegetables'],
+    'chilli': ['Vegetables'],
+    'lettuce': ['Vegetables'],
+}
+
+SLUG_MAX_LENGTH = Plant._meta.get_field('slug').max_length
+META_DESCRIPTION_MAX_LENGTH = Plant._meta.get_field('meta_description').max_length
+
+
+@dataclass
+class ImportStats:
+    """Counts of an import, plus the plant_ids behind each change."""
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    skipped: int = 0
+    changes: Dict[str, List[str]] = field(default_factory=lambda: {
+        'created': [], 'updated': [], 'deactivated': [],
+    })
+
+    @property
+    def changed(self) -> int:
+        return self.created + self.updated + self.deactivated
+
+    def __str__(self):
+        return (
+            f"{self.rows} rows: {self.created} created, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.deactivated} deactivated, {self.skipped} skipped"
+        )
+
+    def report(self) -> Dict:
+        """Change report: the counts and the plant_ids created, updated and deactivated."""
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'deactivated': self.deactivated,
+            'skipped': self.skipped,
+            'changes': self.changes,
+        }
+
+
+def read_csv(path) -> Iterator[PlantRow]:
+    """
+    Stream rows of a plants CSV as PlantRow records.
+
+    The columns may come in any order; extra columns are ignored.
+
+    Raises:
+        ValueError: if the header lacks or repeats any of CSV_COLUMNS, or a
+            row has a different number of fields than the header
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [column for column in CSV_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+        repeated = [column for column in CSV_COLUMNS if header.count(column) > 1]
+        if repeated:
+            raise ValueError(f"{path} repeats columns: {', '.join(repeated)}")
+        # Reorder only when the file's columns differ from data/plants.csv
+        pick = None if header == CSV_COLUMNS else itemgetter(*map(header.index, CSV_COLUMNS))
+        width = len(header)
+        for values in reader:
+            if len(values) != width:
+                if not values:
+                    # Blank line
+                    continue
+                raise ValueError(f"{path}, line {reader.line_num}: {len(values)} fields, expected {width}")
+            yield PlantRow._make(values if pick is None else pick(values))
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def ensure_categories() -> Dict[str, int]:
+    """Create the default categories if needed; returns category pks by name."""
+    PlantCategory.objects.bulk_create(
+        [
+            PlantCategory(name=name, description=description, slug=slugify(name))
+            for name, description in DEFAULT_CATEGORIES.items()
+        ],
+        ignore_conflicts=True,
+    )
+    return dict(PlantCategory.objects.values_list('name', 'pk'))
+
+
+def row_hash(row: PlantRow) -> str:
+    """Stable hash of a row's CSV values."""
+    content = '\x1f'.join(row)
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def enrich_row(row: PlantRow) -> Optional[Dict]:
+    """
+    Derive everything a CSV row needs before it is written: the Plant field
+    values (including those ``Plant.save()`` would derive), a base slug, the
+    care guide text and the categories. Returns None for rows without a
+    plant_id or name.
+
+    Pure and picklable both ways, so it runs in worker processes.
+    """
+    plant_id, name = row.plant_id, row.name
+    if not plant_id or not name:
+        return None
+    fields = row._asdict()
+    del fields['plant_id']
+    fields['is_beginner_friendly'] = 'Beginner' in fields['care_level']
+    fields['meta_description'] = f"{fields['tagline']} Learn how to care for {name}."[:META_DESCRIPTION_MAX_LENGTH]
+    fields['content_hash'] = row_hash(row)
+    return {
+        'plant_id': plant_id,
+        'fields': fields,
+        'slug': slugify(f"{name}-{fields['scientific_name']}")[:SLUG_MAX_LENGTH],
+        'care_guide': {
+            'fertilizing_guide': f"Fertilize {name} monthly during growing season (spring/summer)",
+            'pruning_guide': f"Prune {name} as needed to maintain shape and remove dead growth",
+            'repotting_guide': f"Repot {name} every 1-2 years or when rootbound",
+            'pest_control': "Watch for common pests like aphids and spider mites. Use insecticidal soap if needed.",
+            'disease_prevention': "Ensure good air circulation and avoid overwatering to prevent fungal issues.",
+            'pro_tips': f"Best grown in {fields['space'].lower()}. {fields['common_issues']}",
+            'common_mistakes': "Overwatering is the most common mistake. Let soil dry between waterings.",
+        },
+        'categories': CATEGORY_MAPPING.get(plant_id, []),
+    }
+
+
+class EnrichedChunk(NamedTuple):
+    """A chunk of source rows after the enrich stage."""
+    rows: int
+    # Enriched rows, without the invalid ones
+    records: List[Dict]
+    # plant_ids of all rows, including invalid ones
+    plant_ids: List[str]
+
+
+def enrich_chunk(rows: List[PlantRow]) -> EnrichedChunk:
+    records = [record for record in map(enrich_row, rows) if record is not None]
+    return EnrichedChunk(len(rows), records, [row.plant_id for row in rows if row.plant_id])
+
+
+def enrich_chunks(chunks: Iterable[List[PlantRow]], workers: int = 1) -> Iterator[EnrichedChunk]:
+    """
+    Enrich chunks in order, on a pool of ``workers`` processes if more than one.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    however far the reader could run ahead of the writer.
+    """
+    if workers <= 1:
+        yield from map(enrich_chunk, chunks)
+        return
+    # Workers set Django up themselves in case they are spawned, not forked
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(pool.submit(enrich_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def build_plant(record: Dict) -> Plant:
+    """Unsaved Plant for an enriched row."""
+    return Plant(plant_id=record['plant_id'], slug=record['slug'], **record['fields'])
+
+
+def build_care_guide(plant_pk: int, record: Dict) -> PlantCareGuide:
+    return PlantCareGuide(plant_id=plant_pk, **record['care_guide'])
+
+
+def assign_slugs(plants: List[Plant]) -> None:
+    """Make the slugs of new plants unique, checking the whole chunk in one query."""
+    taken = set(Plant.objects.filter(slug__in=[plant.slug for plant in plants]).values_list('slug', flat=True))
+    for plant in plants:
+        base, n = plant.slug, 1
+        while plant.slug in taken:
+            # Rare: same names, or a collision after truncation
+            n += 1
+            suffix = f'-{n}'
+            plant.slug = f'{base[:SLUG_MAX_LENGTH - len(suffix)]}{suffix}'
+            if plant.slug not in taken and Plant.objects.filter(slug=plant.slug).exists():
+                taken.add(plant.slug)
+        taken.add(plant.slug)
+
+
+def update_plants(plants: List[Plant], fields: List[str]) -> None:
+    """
+    Write ``fields`` of existing plants with one prepared UPDATE.
+
+    ``bulk_update()`` compiles a CASE expression per field over the whole
+    batch, which is several times slower than running a single parametrized
+    statement with ``executemany``.
+    """
+    if not plants:
+        return
+    model_fields = [Plant._meta.get_field(name) for name in fields]
+    quote = connection.ops.quote_name
+    assignments = ', '.join(f'{quote(model_field.column)} = %s' for model_field in model_fields)
+    sql = f'UPDATE {quote(Plant._meta.db_table)} SET {assignments} WHERE {quote(Plant._meta.pk.column)} = %s'
+    params = [
+        [model_field.get_db_prep_save(getattr(plant, model_field.attname), connection) for model_field in model_fields]
+        + [plant.pk]
+        for plant in plants
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+class ImportCheckpoint:
+    """
+    Progress of an import, saved after every committed chunk so an
+    interrupted run can resume where it stopped.
+
+    The checkpoint is a small JSON file with the source file's identity and
+    the counts so far; the plant_ids behind the changes are appended to
+    ``<path>.changes``. A chunk that committed just before a crash, but
+    whose checkpoint was not saved, is simply imported again: its rows now
+    match their content hashes, so it only counts as unchanged.
+    """
+
+    def __init__(self, path, source):
+        self.path = os.fspath(path)
+        self.changes_path = f'{self.path}.changes'
+        stat = os.stat(source)
+        self.source = {'path': os.path.abspath(source), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        self.logged = {action: 0 for action in ImportStats().changes}
+
+    def restore(self, stats: ImportStats) -> int:
+        """
+        Load saved progress into ``stats``; returns the number of source
+        rows already imported (0 without a checkpoint).
+
+        Raises:
+            ValueError: if the checkpoint belongs to another source file, or
+                the file changed since
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return 0
+        if state['source'] != self.source:
+            raise ValueError(f"Checkpoint {self.path} was saved for a different or modified source file")
+        for name, value in state['counts'].items():
+            setattr(stats, name, value)
+        self.logged = state['logged']
+        remaining = dict(self.logged)
+        with open(self.changes_path, encoding='utf-8') as f:
+            for line in f:
+                action, plant_id = json.loads(line)
+                # Entries past the saved counts belong to an unsaved chunk
+                if remaining[action] > 0:
+                    remaining[action] -= 1
+                    stats.changes[action].append(plant_id)
+        return stats.rows
+
+    def save(self, stats: ImportStats) -> None:
+        with open(self.changes_path, 'a', encoding='utf-8') as f:
+            for action, plant_ids in stats.changes.items():
+                for plant_id in plant_ids[self.logged[action]:]:
+                    f.write(json.dumps([action, plant_id]) + '\n')
+                self.logged[action] = len(plant_ids)
+        state = {
+            'source': self.source,
+            'counts': {name: value for name, value in stats.report().items() if name != 'changes'},
+            'logged': self.logged,
+        }
+        # Replace the file in one step, so a crash never leaves half a checkpoint
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        for path in (self.path, self.changes_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class CatalogImporter:
+    """
+    Chunked writer for plant rows.
+
+    Args:
+        chunk_size: rows per transaction
+        update_existing: rewrite existing plants whose row changed (else
+            they are only given missing categories and care guides)
+        featured: mark newly created plants as featured
+        sync: treat the rows as the complete catalog: plants missing from
+            them are deactivated and listed plants reactivated
+    """
+
+    def __init__(self, chunk_size: int = 1000, update_existing: bool = True, featured: bool = False,
+                 sync: bool = False):
+        self.chunk_size = chunk_size
+        self.update_existing = update_existing
+        self.featured = featured
+        self.sync = sync
+        self.stats = ImportStats()
+        self.category_ids = ensure_categories()
+        self.seen: Set[str] = set()
+
+    def run(self, rows: Iterable[PlantRow], workers: int = 1,
+            checkpoint: Optional[ImportCheckpoint] = None,
+            progress: Optional[Callable[[ImportStats], None]] = None) -> ImportStats:
+        """
+        Import ``rows``: they are parsed and chunked here, enriched on
+        ``workers`` processes and written by this process, one transaction
+        per chunk.
+
+        With a checkpoint, progress is saved after each chunk and a previous
+        run's progress is resumed from; ``progress`` is called after each
+        chunk with the running stats.
+        """
+        rows = iter(rows)
+        if checkpoint is not None:
+            for row in islice(rows, checkpoint.restore(self.stats)):
+                if self.sync and row.plant_id:
+                    self.seen.add(row.plant_id)
+        for chunk in enrich_chunks(chunked(rows, self.chunk_size), workers):
+            self.write_chunk(chunk)
+            if checkpoint is not None:
+                checkpoint.save(self.stats)
+            if progress is not None:
+                progress(self.stats)
+        if self.sync:
+            self.deactivate_missing()
+        self.finish()
+        if checkpoint is not None:
+            checkpoint.clear()
+        return self.stats
+
+    def write_chunk(self, chunk: EnrichedChunk) -> None:
+        self.stats.rows += chunk.rows
+        # The last row wins if a plant_id repeats
+        records = {record['plant_id']: record for record in chunk.records}
+        self.stats.skipped += chunk.rows - len(records)
+        if self.sync:
+            # Invalid rows still keep their plant listed
+            self.seen.update(chunk.plant_ids)
+        if not records:
+            return
+
+        now = timezone.now()
+        with transaction.atomic():
+            state = {
+                plant_id: (pk, content_hash, is_active)
+                for plant_id, pk, content_hash, is_active in Plant.objects.filter(
+                    plant_id__in=records
+                ).values_list('plant_id', 'pk', 'content_hash', 'is_active')
+            }
+            existing = {plant_id: pk for plant_id, (pk, _, _) in state.items()}
+            new, changed = [], []
+            unchanged = 0
+            for plant_id, record in records.items():
+                plant = build_plant(record)
+                if plant_id not in state:
+                    plant.is_featured = self.featured
+                    new.append(plant)
+                    continue
+                pk, content_hash, is_active = state[plant_id]
+                if content_hash == plant.content_hash and (is_active or not self.sync):
+                    unchanged += 1
+                    continue
+                plant.pk = pk
+                plant.is_active = is_active or self.sync
+                plant.updated_at = now
+                changed.append(plant)
+
+            if new:
+                assign_slugs(new)
+                Plant.objects.bulk_create(new)
+                if any(plant.pk is None for plant in new):
+                    # Backends that cannot return ids from a bulk insert
+                    existing.update(Plant.objects.filter(
+                        plant_id__in=[plant.plant_id for plant in new]
+                    ).values_list('plant_id', 'pk'))
+                else:
+                    existing.update((plant.plant_id, plant.pk) for plant in new)
+            if changed and self.update_existing:
+                update_plants(changed, UPDATE_FIELDS)
+
+            # Unchanged rows already have their categories and care guide
+            written = {plant.plant_id: records[plant.plant_id] for plant in new + changed}
+            self._write_relations(written, existing)
+            if new or (changed and self.update_existing):
+                touched = [existing[plant.plant_id] for plant in new]
+                if self.update_existing:
+                    touched.extend(plant.pk for plant in changed)
+                get_search_backend().index(
+                    Plant.objects.filter(pk__in=touched).select_related('care_guide')
+                )
+
+        self.stats.created += len(new)
+        self.stats.changes['created'].extend(plant.plant_id for plant in new)
+        self.stats.unchanged += unchanged
+        if self.update_existing:
+            self.stats.updated += len(changed)
+            self.stats.changes['updated'].extend(plant.plant_id for plant in changed)
+        else:
+            self.stats.unchanged += len(changed)
+        logger.info(f"Imported chunk: {self.stats}")
+
+    def deactivate_missing(self) -> None:
+        """Deactivate active plants whose plant_id did not appear in the rows."""
+        missing = [
+            (pk, plant_id)
+            for pk, plant_id in Plant.objects.filter(is_active=True).values_list('pk', 'plant_id').iterator()
+            if plant_id not in self.seen
+        ]
+        now = timezone.now()
+        for chunk in chunked(missing, self.chunk_size):
+            Plant.objects.filter(pk__in=[pk for pk, _ in chunk]).update(is_active=False, updated_at=now)
+        self.stats.deactivated += len(missing)
+        self.stats.changes['deactivated'].extend(plant_id for _, plant_id in missing)
+
+    def _write_relations(self, records: Dict[str, Dict], plant_pks: Dict[str, int]) -> None:
+        """
+        Category links and care guides, one bulk insert each. Existing links
+        are kept; existing care guides get their derived fields rewritten if
+        existing plants are updated (the monthly calendar is left alone).
+        """
+        through = Plant.categories.through
+        links = [
+            through(plant_id=plant_pks[plant_id], plantcategory_id=self.category_ids[name])
+            for plant_id, record in records.items()
+            for name in record['categories']
+            if name in self.category_ids
+        ]
+        through.objects.bulk_create(links, ignore_conflicts=True)
+        care_guides = [build_care_guide(plant_pks[plant_id], record) for plant_id, record in records.items()]
+        if self.update_existing:
+            PlantCareGuide.objects.bulk_create(
+                care_guides, update_conflicts=True, unique_fields=['plant'], update_fields=CARE_GUIDE_FIELDS,
+            )
+        else:
+            PlantCareGuide.objects.bulk_create(care_guides, ignore_conflicts=True)
+
+    def finish(self) -> None:
+        if self.stats.changed:
+            bump_catalog_version()
+
+
+def import_catalog(path, workers: int = 1, checkpoint_path=None, **options) -> ImportStats:
+    """
+    Import a plants CSV; see CatalogImporter for the options. With a
+    ``checkpoint_path`` the import resumes from, and saves progress to, that
+    checkpoint.
+    """
+    checkpoint = ImportCheckpoint(checkpoint_path, path) if checkpoint_path else None
+    return CatalogImporter(**options).run(read_csv(path), workers=workers, checkpoint=checkpoint)
@@ -0,0 +1,31 @@
+"""
+Rebuild the "similar plants" neighbours from user collections.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.plants.similarity import update_plant_similarities
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute item-item plant similarities from user collections. "
+        "Runs incrementally from the last watermark; schedule a periodic --full "
+        "run to pick up deleted collection entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every neighbour list instead of only changed plants',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        updated = update_plant_similarities(full=options['full'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated similar plants for {updated} plants in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,105 @@
+"""
+Bulk import plants from a CSV file.
+"""
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.plants.importer import CatalogImporter, ImportCheckpoint, read_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Import plants from a CSV with the data/plants.csv columns, in chunked "
+        "bulk transactions. Existing plants (by plant_id) are updated when their "
+        "row changed; --sync also deactivates plants missing from the file. "
+        "Rows are enriched on --workers processes; with --checkpoint an "
+        "interrupted import resumes where it stopped."
+    )
+
+    # Seconds between progress lines
+    progress_interval = 5
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_path',
+            nargs='?',
+            default=str(settings.BASE_DIR / 'data' / 'plants.csv'),
+            help='CSV file to import (default: data/plants.csv)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows written per transaction',
+        )
+        parser.add_argument(
+            '--no-update',
+            action='store_true',
+            help='Only create new plants; leave existing ones unchanged',
+        )
+        parser.add_argument(
+            '--featured',
+            action='store_true',
+            help='Mark newly created plants as featured',
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Treat the file as the full catalog: deactivate plants not in it',
+        )
+        parser.add_argument(
+            '--report',
+            metavar='PATH',
+            help='Write a JSON change report (counts and affected plant_ids) to PATH',
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Processes enriching rows (0: one per CPU; default: 1, in-process)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            metavar='PATH',
+            help='Save progress to PATH after each chunk and resume from it if it exists',
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or os.cpu_count() or 1
+        importer = CatalogImporter(
+            chunk_size=options['chunk_size'],
+            update_existing=not options['no_update'],
+            featured=options['featured'],
+            sync=options['sync'],
+        )
+        start = time.perf_counter()
+        last_report = start
+
+        def progress(stats):
+            nonlocal last_report
+            now = time.perf_counter()
+            if now - last_report >= self.progress_interval:
+                last_report = now
+                self.stdout.write(f"{stats} ({now - start:.0f}s)")
+
+        try:
+            checkpoint = None
+            if options['checkpoint']:
+                checkpoint = ImportCheckpoint(options['checkpoint'], options['csv_path'])
+            stats = importer.run(
+                read_csv(options['csv_path']), workers=workers, checkpoint=checkpoint, progress=progress,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(stats.report(), f, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats} in {elapsed:.2f}s ({stats.rows / max(elapsed, 1e-6):.0f} rows/s)"
+        ))
@@ -0,0 +1,21 @@
+"""
+Repopulate the plant full-text search index.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.plants.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the plant search index (needed after bulk imports or raw SQL changes)."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        start = time.perf_counter()
+        count = backend.rebuild()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {count} plants with the {backend.name} backend in {elapsed:.2f}s"
+        ))
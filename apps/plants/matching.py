@@ -0,0 +1,236 @@
+"""
+In-memory name lookup for matching external plant names to the catalog.
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .cache import CatalogIndex
+from .models import Plant
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Score of a genus-only match ("Ocimum", "Solanum sp."): below any exact match,
+# and fixed, since trigram similarity against a full binomial depends mostly
+# on the length of the species epithet
+GENUS_MATCH_SCORE = 0.5
+
+# Infraspecific ranks and cultivar names that Plant.id appends to a binomial
+_QUALIFIERS = re.compile(r"\s+(?:var|subsp|ssp|f|cv)\.\s.*$|\s*['\"‘’“”].*$", re.IGNORECASE)
+
+
+def normalize_name(value: str) -> str:
+    """Casefold, strip accents and punctuation, and collapse whitespace."""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(c for c in value if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(' ', value.casefold()).strip()
+
+
+def strip_qualifiers(value: str) -> str:
+    """Drop variety, subspecies and cultivar suffixes from a plant name."""
+    return _QUALIFIERS.sub('', value).strip()
+
+
+def trigrams(value: str) -> FrozenSet[str]:
+    """
+    Character trigrams of a normalized string, padded per word like pg_trgm.
+    """
+    grams = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """
+    Inverted index from character trigrams to catalog names.
+    
+    Similarity is the Jaccard coefficient of the trigram sets (the same
+    measure as pg_trgm's ``similarity()``). Shared-trigram counts for every
+    name are computed in one vectorised pass over the query's posting
+    lists, which keeps a lookup under a millisecond on catalogs of tens of
+    thousands of plants.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._sizes: List[int] = []
+        self._pks: List[int] = []
+        self._frozen = None
+
+    def add(self, text: str, pk: int) -> None:
+        grams = trigrams(normalize_name(text))
+        if not grams:
+            return
+        entry_id = len(self._pks)
+        self._pks.append(pk)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(entry_id)
+        self._frozen = None
+
+    def _freeze(self):
+        if self._frozen is None:
+            postings = {
+                gram: np.array(entry_ids, dtype=np.int32)
+                for gram, entry_ids in self._postings.items()
+            }
+            self._frozen = (
+                postings,
+                np.array(self._sizes, dtype=np.int32),
+                np.array(self._pks, dtype=np.int64),
+            )
+        return self._frozen
+
+    def search(self, term: str, limit: int = 5, threshold: float = 0.3) -> List[Tuple[int, float]]:
+        """Return up to ``limit`` (pk, score) pairs ranked by similarity."""
+        query = trigrams(normalize_name(term))
+        if not query or not self._pks:
+            return []
+
+        postings, sizes, pks = self._freeze()
+        matched = [postings[gram] for gram in query if gram in postings]
+        if not matched:
+            return []
+
+        shared = np.bincount(np.concatenate(matched), minlength=len(sizes))
+        # Jaccard >= threshold implies at least threshold * |query| shared trigrams
+        candidates = np.flatnonzero(shared >= max(1, math.ceil(threshold * len(query))))
+        scores = shared[candidates] / (len(query) + sizes[candidates] - shared[candidates])
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+
+        ranked = []
+        seen = set()
+        for i in np.argsort(-scores, kind='stable'):
+            pk = int(pks[candidates[i]])
+            if pk in seen:
+                continue
+            seen.add(pk)
+            ranked.append((pk, float(scores[i])))
+            if len(ranked) == limit:
+                break
+        return ranked
+
+
+def name_synonyms(name: str, scientific_name: str, plant_id: str) -> List[str]:
+    """Alternative spellings a plant can be identified by."""
+    synonyms = [plant_id.replace('_', ' ')]
+
+    # Bare binomial, without variety/cultivar qualifiers or authority
+    binomial = scientific_name.split()[:2]
+    if len(binomial) == 2:
+        synonyms.append(' '.join(binomial))
+
+    # Singular forms of plural common names ("Cherry Tomatoes")
+    if name.lower().endswith('es'):
+        synonyms.append(name[:-2])
+    if name.lower().endswith('s'):
+        synonyms.append(name[:-1])
+
+    return synonyms
+
+
+class PlantNameIndex:
+    """
+    Lookup tables of normalized names for all active plants.
+
+    Every candidate term is first tried as an exact (normalized) match on
+    common name, scientific name or synonym, with and without cultivar
+    qualifiers. If none match, the best trigram similarity match above
+    ``PLANT_MATCH_SIMILARITY_THRESHOLD`` is used, or a genus-only term is
+    matched to the plants of that genus with ``GENUS_MATCH_SCORE``.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, str, str, str]]):
+        self.by_name: Dict[str, int] = {}
+        self.by_scientific_name: Dict[str, int] = {}
+        self.by_synonym: Dict[str, int] = {}
+        self.by_genus: Dict[str, List[int]] = defaultdict(list)
+        self.trigrams = TrigramIndex()
+
+        # Rows arrive in catalog order, so the first plant wins on collisions
+        for pk, name, scientific_name, plant_id in rows:
+            normalized = normalize_name(name)
+            self.by_name.setdefault(normalized, pk)
+            normalized_scientific_name = normalize_name(scientific_name)
+            self.by_scientific_name.setdefault(normalized_scientific_name, pk)
+            if normalized_scientific_name:
+                self.by_genus[normalized_scientific_name.split()[0]].append(pk)
+            self.trigrams.add(name, pk)
+            self.trigrams.add(scientific_name, pk)
+            for synonym in name_synonyms(name, scientific_name, plant_id):
+                self.by_synonym.setdefault(normalize_name(synonym), pk)
+
+    @classmethod
+    def build(cls) -> 'PlantNameIndex':
+        rows = Plant.objects.filter(is_active=True).order_by('name', 'pk').values_list(
+            'pk', 'name', 'scientific_name', 'plant_id'
+        )
+        return cls(rows.iterator())
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def lookup(self, term: str) -> Optional[int]:
+        """Return the primary key of an exact (normalized) match for a term."""
+        normalized = normalize_name(term)
+        if not normalized:
+            return None
+        return (
+            self.by_name.get(normalized)
+            or self.by_scientific_name.get(normalized)
+            or self.by_synonym.get(normalized)
+        )
+
+    def genus_lookup(self, term: str) -> List[int]:
+        """Primary keys of the plants of a genus, for a genus-only term ("Ocimum", "Ocimum sp.")."""
+        words = normalize_name(strip_qualifiers(term)).split()
+        if len(words) == 1 or (len(words) == 2 and words[1] in ('sp', 'spp')):
+            return self.by_genus.get(words[0], [])
+        return []
+
+    def search(self, term: str, limit: int = 5, threshold: Optional[float] = None) -> List[Tuple[int, float]]:
+        """Return ranked (pk, score) candidates for a term; exact matches score 1.0."""
+        if threshold is None:
+            threshold = settings.PLANT_MATCH_SIMILARITY_THRESHOLD
+
+        pk = self.lookup(term) or self.lookup(strip_qualifiers(term))
+        if pk:
+            fuzzy = self.trigrams.search(term, limit=limit, threshold=threshold)
+            return [(pk, 1.0)] + [c for c in fuzzy if c[0] != pk][:limit - 1]
+        ranked = dict(self.trigrams.search(strip_qualifiers(term), limit=limit, threshold=threshold))
+        for pk in self.genus_lookup(term)[:limit]:
+            ranked[pk] = max(ranked.get(pk, 0.0), GENUS_MATCH_SCORE)
+        return sorted(ranked.items(), key=lambda candidate: -candidate[1])[:limit]
+
+    def resolve(self, terms: Iterable[str]) -> Tuple[Optional[int], float]:
+        """
+        Return the (pk, score) of the best plant matching any of the terms.
+
+        Terms are given in priority order, so an exact match on an earlier
+        term wins over any fuzzy match.
+        """
+        terms = [term for term in terms if term]
+        for term in terms:
+            pk = self.lookup(term) or self.lookup(strip_qualifiers(term))
+            if pk:
+                return pk, 1.0
+
+        best_pk, best_score = None, 0.0
+        for term in terms:
+            for pk, score in self.search(term, limit=1):
+                if score > best_score:
+                    best_pk, best_score = pk, score
+        return best_pk, best_score
+
+
+plant_name_index: CatalogIndex[PlantNameIndex] = CatalogIndex(PlantNameIndex.build)
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("plants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlantSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text="Cosine similarity of collection interactions"
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "watermark",
+                    models.DateTimeField(
+                        help_text="Latest collection change included in this score"
+                    ),
+                ),
+                (
+                    "plant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similarities",
+                        to="plants.plant",
+                    ),
+                ),
+                (
+                    "similar_plant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="similar_to",
+                        to="plants.plant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Plant Similarities",
+                "ordering": ["plant", "rank"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="plantsimilarity",
+            constraint=models.UniqueConstraint(
+                fields=("plant", "rank"), name="unique_plant_similarity_rank"
+            ),
+        ),
+    ]
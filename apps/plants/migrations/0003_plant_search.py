@@ -0,0 +1,117 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:48
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# The search index as it was when this migration was written; it does not
+# follow later changes to apps.plants.search
+
+GIN_INDEX = "plants_plant_search_vector_gin"
+
+FTS_TABLE = "plants_plant_fts"
+
+# Document fields, most important first: (name, weight)
+DOCUMENT_FIELDS = [
+    ("name", "A"),
+    ("scientific_name", "A"),
+    ("tagline", "B"),
+    ("description", "C"),
+    ("care", "D"),
+]
+
+PLANT_CARE_FIELDS = [
+    "watering_frequency", "sunlight_needs", "watering_guide", "sunlight_guide",
+    "potting_tips", "common_issues",
+]
+
+CARE_GUIDE_FIELDS = [
+    "fertilizing_guide", "pruning_guide", "repotting_guide", "pest_control",
+    "disease_prevention", "pro_tips", "common_mistakes",
+]
+
+
+def postgres_vector_sql(plant_table, care_guide_table):
+    """UPDATE filling search_vector for every plant; takes the text search config as its parameter."""
+    care_guide = (
+        f"(SELECT concat_ws(E'\\n', {', '.join(f'g.{field}' for field in CARE_GUIDE_FIELDS)}) "
+        f"FROM {care_guide_table} g WHERE g.plant_id = p.id)"
+    )
+    columns = {field: f"p.{field}" for field, _ in DOCUMENT_FIELDS if field != "care"}
+    columns["care"] = (
+        f"concat_ws(E'\\n', {', '.join(f'p.{field}' for field in PLANT_CARE_FIELDS)}, "
+        f"coalesce({care_guide}, ''))"
+    )
+    vector = " || ".join(
+        f"setweight(to_tsvector(%(config)s::regconfig, coalesce({columns[field]}, '')), '{weight}')"
+        for field, weight in DOCUMENT_FIELDS
+    )
+    return f"UPDATE {plant_table} p SET search_vector = {vector}"
+
+
+def sqlite_rows(Plant):
+    """(rowid, name, scientific_name, tagline, description, care) per plant."""
+    for plant in Plant.objects.select_related("care_guide").order_by("pk").iterator(chunk_size=500):
+        care = [getattr(plant, field) for field in PLANT_CARE_FIELDS]
+        care_guide = getattr(plant, "care_guide", None)
+        if care_guide is not None:
+            care.extend(getattr(care_guide, field) for field in CARE_GUIDE_FIELDS)
+        yield [
+            plant.pk, plant.name, plant.scientific_name, plant.tagline, plant.description,
+            "\n".join(text for text in care if text),
+        ]
+
+
+def create_search_index(apps, schema_editor):
+    Plant = apps.get_model("plants", "Plant")
+    PlantCareGuide = apps.get_model("plants", "PlantCareGuide")
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {GIN_INDEX} ON {Plant._meta.db_table} USING gin (search_vector)"
+        )
+        schema_editor.execute(
+            postgres_vector_sql(Plant._meta.db_table, PlantCareGuide._meta.db_table),
+            {"config": settings.PLANT_SEARCH_CONFIG},
+        )
+    elif vendor == "sqlite":
+        columns = ", ".join(field for field, _ in DOCUMENT_FIELDS)
+        with schema_editor.connection.cursor() as cursor:
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                    f"USING fts5({columns}, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            except Exception:
+                # Without FTS5, plant search falls back to icontains
+                return
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES (%s, %s, %s, %s, %s, %s)",
+                sqlite_rows(Plant),
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("plants", "0002_plant_similarity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plant",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("plants", "0003_plant_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="plant",
+            index=models.Index(fields=["name", "id"], name="plants_plant_name_id_idx"),
+        ),
+    ]
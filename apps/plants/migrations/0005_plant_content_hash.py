@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("plants", "0004_plant_name_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="plant",
+            name="content_hash",
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+    ]
@@ -1,11 +1,14 @@
 """
 Models for the plants app.
 """
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.text import slugify
 
+from .renditions import ImageSource
+
 
 class PlantCategory(models.Model):
     """
@@ -30,6 +33,16 @@ class PlantCategory(models.Model):
         super().save(*args, **kwargs)
 
 
+class PlantManager(models.Manager):
+    """
+    Default plant manager. Leaves out ``search_vector``, which only the
+    search queries use, so listings do not fetch a tsvector per row.
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class Plant(models.Model):
     """
     Main plant model based on the CSV data structure.
@@ -95,12 +108,22 @@ class Plant(models.Model):
     meta_description = models.CharField(max_length=160, blank=True)
     meta_keywords = models.CharField(max_length=200, blank=True)
     
+    # Full-text search (PostgreSQL only; GIN index created in migration 0003)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Hash of the source CSV row, so catalog syncs only rewrite changed plants
+    content_hash = models.CharField(max_length=40, blank=True, editable=False)
+    
+    objects = PlantManager()
+    
     class Meta:
         ordering = ['name']
         indexes = [
             models.Index(fields=['plant_id']),
             models.Index(fields=['sunlight', 'care_level']),
             models.Index(fields=['is_featured', 'is_active']),
+            # Keyset pagination seeks on (name, id)
+            models.Index(fields=['name', 'id'], name='plants_plant_name_id_idx'),
         ]
     
     def __str__(self):
@@ -118,10 +141,10 @@ class Plant(models.Model):
     
     @property
     def primary_image(self):
-        """Return the primary image (uploaded image first, then URL)"""
+        """Return the primary image (uploaded image first, then URL), with its renditions"""
         if self.image:
-            return self.image.url
-        return self.image_url
+            return ImageSource(self.image.url, self.image)
+        return ImageSource(self.image_url)
     
     @property
     def care_level_display(self):
@@ -193,3 +216,33 @@ class PlantImage(models.Model):
     
     def __str__(self):
         return f"{self.plant.name} - Image {self.id}"
+    
+    @property
+    def image_source(self):
+        """The image URL, with its renditions"""
+        return ImageSource(self.image.url, self.image)
+
+
+class PlantSimilarity(models.Model):
+    """
+    Precomputed "people who grew this also grew" neighbours of a plant.
+    
+    Rows are written by ``manage.py compute_plant_similarity`` from the
+    user collection table and hold the top-k neighbours per plant, so the
+    detail page reads them with one indexed query.
+    """
+    plant = models.ForeignKey(Plant, on_delete=models.CASCADE, related_name='similarities')
+    similar_plant = models.ForeignKey(Plant, on_delete=models.CASCADE, related_name='similar_to')
+    score = models.FloatField(help_text="Cosine similarity of collection interactions")
+    rank = models.PositiveSmallIntegerField()
+    watermark = models.DateTimeField(help_text="Latest collection change included in this score")
+    
+    class Meta:
+        verbose_name_plural = "Plant Similarities"
+        ordering = ['plant', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['plant', 'rank'], name='unique_plant_similarity_rank'),
+        ]
+    
+    def __str__(self):
+        return f"{self.plant.name} ~ {self.similar_plant.name} ({self.score:.2f})"
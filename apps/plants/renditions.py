@@ -0,0 +1,194 @@
+"""
+Image renditions for the plants app.
+
+Plant photos are served as fixed-size renditions instead of the original
+file. Each named size in ``PLANT_IMAGE_RENDITIONS`` is a box the image is
+cropped to, made at 1x and 2x for ``srcset``, as WebP with a JPEG fallback.
+
+Renditions of uploaded images are stored next to the original, under
+``renditions/`` with deterministic names that include the original's
+extension and a digest of its name, size and modification time
+(``plants/mint.jpg`` -> ``plants/renditions/mint-jpg-1a2b3c4d-400x300.webp``),
+so files sharing a stem, or re-uploaded under a reused name, never share
+renditions. They are made when the image is uploaded and otherwise on first
+use; the digest and whether a rendition exists are cached, so pages do not
+touch storage once it does. Unsplash URLs are resized by Unsplash
+through their ``w``/``h``/``fm`` parameters; other external URLs are used as
+they are.
+"""
+import hashlib
+import io
+import logging
+import posixpath
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# Rendition format -> (Pillow format, file extension)
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+CONTENT_TYPES = {
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+}
+
+# Pixel densities made of every size, for srcset
+DENSITIES = (1, 2)
+
+UNSPLASH_HOST = 'images.unsplash.com'
+
+
+def rendition_box(size: str, density: int = 1) -> Tuple[int, int]:
+    """
+    Pixel width and height of a named size at a pixel density.
+
+    Raises:
+        ValueError: for a size not in PLANT_IMAGE_RENDITIONS
+    """
+    try:
+        width, height = settings.PLANT_IMAGE_RENDITIONS[size]
+    except KeyError:
+        raise ValueError(f"Unknown image rendition size: {size}")
+    return width * density, height * density
+
+
+def source_digest(field_file) -> str:
+    """Short digest of an uploaded file's name, size and modification time."""
+    key = f'rendition-source:{field_file.name}'
+    digest = cache.get(key)
+    if digest is None:
+        storage = field_file.storage
+        identity = [field_file.name]
+        for stat in (storage.size, storage.get_modified_time):
+            try:
+                identity.append(str(stat(field_file.name)))
+            except (OSError, NotImplementedError):
+                pass
+        digest = hashlib.md5('\x1f'.join(identity).encode()).hexdigest()[:8]
+        cache.set(key, digest, settings.CATALOG_CACHE_TTL)
+    return digest
+
+
+def forget_source(field_file) -> None:
+    """Drop the cached digest of a file that may have been replaced."""
+    cache.delete(f'rendition-source:{field_file.name}')
+
+
+def rendition_name(name: str, digest: str, width: int, height: int, image_format: str) -> str:
+    """Storage name of a rendition of the file ``name`` (with ``digest`` from source_digest)."""
+    directory, filename = posixpath.split(name)
+    stem, extension = posixpath.splitext(filename)
+    stem = f"{stem}-{extension.lstrip('.').lower()}" if extension else stem
+    return posixpath.join(
+        directory, 'renditions', f'{stem}-{digest}-{width}x{height}.{FORMATS[image_format][1]}'
+    )
+
+
+def render(source, width: int, height: int, image_format: str) -> bytes:
+    """
+    Crop an image file to ``width`` x ``height`` around its centre and
+    encode it. Metadata (EXIF, GPS, ICC) is not carried over.
+    """
+    with Image.open(source) as image:
+        # Let the JPEG decoder scale down by a power of two while decoding
+        image.draft('RGB', (width, height))
+        image = ImageOps.exif_transpose(image)
+        keep_alpha = image_format == 'webp' and 'A' in image.getbands()
+        mode = 'RGBA' if keep_alpha else 'RGB'
+        if image.mode != mode:
+            image = image.convert(mode)
+        image = ImageOps.fit(image, (width, height), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format=FORMATS[image_format][0], quality=settings.PLANT_IMAGE_RENDITION_QUALITY)
+    return output.getvalue()
+
+
+def ensure_rendition(field_file, width: int, height: int, image_format: str) -> Optional[str]:
+    """
+    Storage name of a rendition of an uploaded image, made first if needed.
+    Returns None if the image cannot be decoded.
+    """
+    name = rendition_name(field_file.name, source_digest(field_file), width, height, image_format)
+    key = f'rendition:{name}'
+    exists = cache.get(key)
+    if exists is not None:
+        return name if exists else None
+
+    storage = field_file.storage
+    if not storage.exists(name):
+        try:
+            with storage.open(field_file.name, 'rb') as source:
+                data = render(source, width, height, image_format)
+        except (OSError, Image.DecompressionBombError) as e:
+            logger.warning(f"Cannot make rendition {name}: {e}")
+            cache.set(key, False, settings.CATALOG_CACHE_TTL)
+            return None
+        saved = storage.save(name, ContentFile(data))
+        if saved != name:
+            # Another worker wrote it first, and storage picked a new name for ours
+            storage.delete(saved)
+        logger.info(f"Made rendition {name} ({len(data)} bytes)")
+    cache.set(key, True, settings.CATALOG_CACHE_TTL)
+    return name
+
+
+def generate_renditions(field_file) -> None:
+    """Make every size, density and format of an uploaded image."""
+    # The upload may have replaced a file of the same name
+    forget_source(field_file)
+    for size in settings.PLANT_IMAGE_RENDITIONS:
+        for density in DENSITIES:
+            for image_format in FORMATS:
+                ensure_rendition(field_file, *rendition_box(size, density), image_format)
+
+
+def resize_url(url: str, width: int, height: int, image_format: str) -> str:
+    """URL of an external image at a size, for hosts that resize on request."""
+    parts = urlsplit(url)
+    if parts.hostname != UNSPLASH_HOST:
+        return url
+    query = dict(parse_qsl(parts.query))
+    query.update(w=width, h=height, fit='crop', fm=FORMATS[image_format][1])
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ImageSource(str):
+    """
+    URL of a plant image, with accessors for its renditions.
+
+    It is the original URL as a string, so it still works wherever a plain
+    URL did (templates, serializers); ``field_file`` is set for uploads.
+    """
+
+    def __new__(cls, url: str, field_file=None):
+        source = super().__new__(cls, url)
+        source.field_file = field_file
+        return source
+
+    def rendition(self, size: str, image_format: str = 'jpeg', density: int = 1) -> str:
+        """URL of the image at a named size; the original URL if it cannot be resized."""
+        width, height = rendition_box(size, density)
+        if not self:
+            return ''
+        if self.field_file is None:
+            return resize_url(str(self), width, height, image_format)
+        name = ensure_rendition(self.field_file, width, height, image_format)
+        if name is None:
+            return str(self)
+        return self.field_file.storage.url(name)
+
+    def srcset(self, size: str, image_format: str = 'jpeg') -> str:
+        """``srcset`` value with the image at every density of a named size."""
+        return ', '.join(
+            f'{self.rendition(size, image_format, density)} {rendition_box(size, density)[0]}w'
+            for density in DENSITIES
+        )
@@ -0,0 +1,282 @@
+"""
+Full-text plant search for the plants app.
+
+Searches names, tagline, description and care text, ranked by relevance,
+with a highlighted snippet per result. The backend follows the database:
+
+* PostgreSQL: a weighted ``search_vector`` column on Plant behind a GIN index
+* SQLite: an FTS5 table (``plants_plant_fts``) keyed by plant id
+* anything else: ``icontains`` over the names and tagline, unranked
+
+Indexes are kept current by the plants signals; ``manage.py
+rebuild_search_index`` repopulates them after bulk changes.
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, FloatField, OuterRef, Q, QuerySet, Subquery, TextField, Value, When
+from django.db.models.functions import Coalesce, Concat
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'plants_plant_fts'
+
+# Document fields, most important first: (name, weight)
+DOCUMENT_FIELDS = [
+    ('name', 'A'),
+    ('scientific_name', 'A'),
+    ('tagline', 'B'),
+    ('description', 'C'),
+    ('care', 'D'),
+]
+
+PLANT_CARE_FIELDS = [
+    'watering_frequency', 'sunlight_needs', 'watering_guide', 'sunlight_guide',
+    'potting_tips', 'common_issues',
+]
+
+CARE_GUIDE_FIELDS = [
+    'fertilizing_guide', 'pruning_guide', 'repotting_guide', 'pest_control',
+    'disease_prevention', 'pro_tips', 'common_mistakes',
+]
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+_WORDS = re.compile(r'\w+', re.UNICODE)
+
+
+def search_document(plant) -> Dict[str, str]:
+    """Text of each indexed field for a plant (care guide included if loaded)."""
+    care = [getattr(plant, field) for field in PLANT_CARE_FIELDS]
+    care_guide = getattr(plant, 'care_guide', None)
+    if care_guide is not None:
+        care.extend(getattr(care_guide, field) for field in CARE_GUIDE_FIELDS)
+    return {
+        'name': plant.name,
+        'scientific_name': plant.scientific_name,
+        'tagline': plant.tagline,
+        'description': plant.description,
+        'care': '\n'.join(text for text in care if text),
+    }
+
+
+def highlight_html(value: Optional[str]) -> str:
+    """Escape a search snippet, keeping only the highlight markers as HTML."""
+    if not value:
+        return ''
+    escaped = escape(value)
+    escaped = escaped.replace(escape(HIGHLIGHT_START), HIGHLIGHT_START)
+    escaped = escaped.replace(escape(HIGHLIGHT_STOP), HIGHLIGHT_STOP)
+    return mark_safe(escaped)
+
+
+class SearchBackend:
+    """
+    Plain ``icontains`` search, used when no full-text index is available.
+
+    Every backend's ``search()`` returns the queryset filtered to matching
+    plants, annotated with ``search_rank`` (higher is better) and
+    ``search_highlight``, and ordered by rank then name.
+    """
+    name = 'basic'
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        return queryset.filter(
+            Q(name__icontains=term) |
+            Q(scientific_name__icontains=term) |
+            Q(tagline__icontains=term)
+        ).annotate(
+            search_rank=Case(
+                When(name__iexact=term, then=Value(3.0)),
+                When(name__istartswith=term, then=Value(2.0)),
+                default=Value(1.0),
+                output_field=FloatField(),
+            ),
+            search_highlight=F('tagline'),
+        ).order_by('-search_rank', 'name')
+
+    def index(self, plants: Iterable) -> None:
+        pass
+
+    def remove(self, pks: Iterable[int]) -> None:
+        pass
+
+    def rebuild(self, chunk_size: int = 500) -> int:
+        """Reindex every plant; returns the number indexed."""
+        from .models import Plant
+
+        queryset = Plant._default_manager.select_related('care_guide').order_by('pk')
+        self.clear()
+        count = 0
+        batch: List = []
+        for plant in queryset.iterator(chunk_size=chunk_size):
+            batch.append(plant)
+            if len(batch) == chunk_size:
+                self.index(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.index(batch)
+            count += len(batch)
+        return count
+
+    def clear(self) -> None:
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Weighted tsvector per plant, matched with ``websearch_to_tsquery``.
+    """
+    name = 'postgresql'
+
+    @staticmethod
+    def _joined(fields: List[str]) -> Concat:
+        parts = []
+        for field in fields:
+            parts.extend([F(field), Value('\n')])
+        return Concat(*parts[:-1], output_field=TextField())
+
+    def _vector(self):
+        """The search_document() fields as a weighted vector computed from each row's own columns."""
+        from django.contrib.postgres.search import SearchVector
+        from .models import PlantCareGuide
+
+        care_guide = PlantCareGuide.objects.filter(plant=OuterRef('pk')).annotate(
+            text=self._joined(CARE_GUIDE_FIELDS)
+        ).values('text')[:1]
+        columns = {
+            'name': F('name'),
+            'scientific_name': F('scientific_name'),
+            'tagline': F('tagline'),
+            'description': F('description'),
+            'care': Concat(
+                self._joined(PLANT_CARE_FIELDS),
+                Value('\n'),
+                Coalesce(Subquery(care_guide), Value('')),
+                output_field=TextField(),
+            ),
+        }
+        config = settings.PLANT_SEARCH_CONFIG
+        vector = None
+        for field, weight in DOCUMENT_FIELDS:
+            part = SearchVector(columns[field], weight=weight, config=config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def index(self, plants: Iterable) -> None:
+        # One UPDATE per batch: the vector is computed in the database from
+        # the stored rows, so the plants only provide their pks
+        plants = list(plants)
+        if not plants:
+            return
+        type(plants[0])._default_manager.filter(pk__in=[plant.pk for plant in plants]).update(
+            search_vector=self._vector()
+        )
+
+    def clear(self) -> None:
+        # Vectors are overwritten in place by rebuild()
+        pass
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+        config = settings.PLANT_SEARCH_CONFIG
+        query = SearchQuery(term, search_type='websearch', config=config)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query),
+            search_highlight=SearchHeadline(
+                Concat('tagline', Value(' '), 'description', output_field=TextField()),
+                query,
+                config=config,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=25,
+                min_words=10,
+            ),
+        ).order_by('-search_rank', 'name')
+
+
+class SqliteSearchBackend(SearchBackend):
+    """
+    FTS5 table; every query word matches as a prefix ("tomato" finds
+    "tomatoes"). Porter stemming is not used because it also stems the
+    prefixes of partially typed words ("bas" would search for "ba").
+    """
+    name = 'sqlite_fts5'
+
+    # bm25() column weights, in DOCUMENT_FIELDS order
+    COLUMN_WEIGHTS = '10.0, 10.0, 4.0, 2.0, 1.0'
+
+    @staticmethod
+    def match_expression(term: str) -> str:
+        words = _WORDS.findall(term)
+        if not words:
+            return ''
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, queryset: QuerySet, term: str) -> QuerySet:
+        match = self.match_expression(term)
+        if not match:
+            return queryset.none()
+        # FTS5 ranking functions only work inside the MATCH query itself,
+        # so the virtual table is joined in rather than used as a subquery
+        return queryset.extra(
+            select={
+                'search_rank': f'-bm25({FTS_TABLE}, {self.COLUMN_WEIGHTS})',
+                'search_highlight': (
+                    f"snippet({FTS_TABLE}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', 20)"
+                ),
+            },
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = plants_plant.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+        ).order_by('-search_rank', 'name')
+
+    def index(self, plants: Iterable) -> None:
+        rows = []
+        for plant in plants:
+            document = search_document(plant)
+            rows.append([plant.pk] + [document[field] for field, _ in DOCUMENT_FIELDS])
+        if not rows:
+            return
+        columns = ', '.join(field for field, _ in DOCUMENT_FIELDS)
+        placeholders = ', '.join(['%s'] * (len(DOCUMENT_FIELDS) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[row[0]] for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, {columns}) VALUES ({placeholders})', rows
+            )
+
+    def remove(self, pks: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[pk] for pk in pks])
+
+    def clear(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> SearchBackend:
+    """Return the search backend for the default database."""
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        return SqliteSearchBackend()
+    return SearchBackend()
+
+
+def search_plants(queryset: QuerySet, term: str) -> QuerySet:
+    """Filter a plant queryset to a search term, best matches first."""
+    term = (term or '').strip()
+    if not term:
+        return queryset
+    return get_search_backend().search(queryset, term)
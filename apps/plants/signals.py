@@ -0,0 +1,64 @@
+"""
+Signal handlers for the plants app.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_catalog_version
+from .models import Plant, PlantCareGuide, PlantCategory, PlantImage
+from .renditions import generate_renditions
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_delete, sender=Plant)
+@receiver(post_save, sender=PlantCategory)
+@receiver(post_delete, sender=PlantCategory)
+@receiver(post_save, sender=PlantCareGuide)
+@receiver(post_delete, sender=PlantCareGuide)
+@receiver(post_save, sender=PlantImage)
+@receiver(post_delete, sender=PlantImage)
+def invalidate_catalog(sender, **kwargs):
+    """Bump the catalog version once the change is visible to other workers."""
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(m2m_changed, sender=Plant.categories.through)
+def invalidate_catalog_categories(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Plant)
+def index_plant(sender, instance, raw=False, **kwargs):
+    """Keep the search index in step with the plant, in the same transaction."""
+    if not raw:
+        get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Plant)
+def unindex_plant(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(post_save, sender=PlantCareGuide)
+@receiver(post_delete, sender=PlantCareGuide)
+def reindex_care_guide_plant(sender, instance, raw=False, **kwargs):
+    """Care guide text is part of its plant's search document."""
+    if raw:
+        return
+    plant = Plant.objects.select_related('care_guide').filter(pk=instance.plant_id).first()
+    if plant is not None:
+        get_search_backend().index([plant])
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_save, sender=PlantImage)
+def make_image_renditions(sender, instance, raw=False, **kwargs):
+    """Resize uploads once they are saved; existing renditions are kept."""
+    if raw or not settings.PLANT_IMAGE_RENDITIONS_ON_UPLOAD or not instance.image:
+        return
+    image = instance.image
+    transaction.on_commit(lambda: generate_renditions(image))
@@ -0,0 +1,203 @@
+"""
+Item-item collaborative filtering over user plant collections.
+
+Each collection row is an interaction between a user and a plant, weighted
+by its status, rating and ``would_recommend`` flag. Two plants are similar
+when the same users interact with both: the score is the cosine similarity
+of their interaction columns. Only the top ``PLANT_SIMILARITY_NEIGHBOURS``
+neighbours per plant are stored, in ``PlantSimilarity``.
+
+Incremental runs only recompute plants whose collection rows changed since
+the last run (the stored watermark). Similarity between two unchanged
+plants cannot move, so neighbour lists of the other plants are patched
+with the new scores instead of being rebuilt. Deleted collection rows and
+neighbours pushed out of a truncated list are only picked up by a full
+rebuild, which should run periodically.
+"""
+import logging
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max
+
+from .cache import bump_catalog_version, cached_catalog
+from .models import Plant, PlantSimilarity
+
+logger = logging.getLogger(__name__)
+
+# Base interaction strength per UserPlantCollection status
+STATUS_WEIGHTS = {
+    'successfully_grown': 1.0,
+    'currently_growing': 0.8,
+    'want_to_grow': 0.5,
+    'had_issues': 0.2,
+}
+
+
+def interaction_weight(status: str, rating: Optional[int], would_recommend: Optional[bool]) -> float:
+    """Strength of one user's interaction with a plant."""
+    weight = STATUS_WEIGHTS.get(status, 0.5)
+    if rating:
+        weight *= min(rating, 5) / 3
+    if would_recommend is not None:
+        weight *= 1.25 if would_recommend else 0.75
+    return weight
+
+
+def _collection_rows(**filters) -> Iterable[Tuple[int, int, float]]:
+    from apps.accounts.models import UserPlantCollection
+
+    rows = UserPlantCollection.objects.filter(**filters).values_list(
+        'user_id', 'plant_id', 'status', 'rating', 'would_recommend'
+    )
+    for user_pk, plant_pk, status, rating, would_recommend in rows.iterator(chunk_size=5000):
+        yield user_pk, plant_pk, interaction_weight(status, rating, would_recommend)
+
+
+def get_watermark():
+    """Latest collection change already reflected in PlantSimilarity."""
+    return PlantSimilarity.objects.aggregate(watermark=Max('watermark'))['watermark']
+
+
+def compute_similarities(targets: Optional[Set[int]] = None) -> Dict[int, Dict[int, float]]:
+    """
+    Cosine similarity of every target plant to each plant it co-occurs with.
+
+    Reads the collections of every user who has a target plant, plus the
+    interaction norms of all plants involved. ``None`` means all plants.
+    """
+    from apps.accounts.models import UserPlantCollection
+
+    if targets is None:
+        rows = _collection_rows()
+    else:
+        users = UserPlantCollection.objects.filter(plant_id__in=targets).order_by().values('user_id')
+        rows = _collection_rows(user_id__in=users)
+
+    by_user: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+    norms: Dict[int, float] = defaultdict(float)
+    for user_pk, plant_pk, weight in rows:
+        by_user[user_pk].append((plant_pk, weight))
+        if targets is None:
+            norms[plant_pk] += weight * weight
+
+    dots: Dict[int, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+    for interactions in by_user.values():
+        for plant_pk, weight in interactions:
+            if targets is not None and plant_pk not in targets:
+                continue
+            for other_pk, other_weight in interactions:
+                if other_pk != plant_pk:
+                    dots[plant_pk][other_pk] += weight * other_weight
+
+    if targets is not None:
+        # Norms need every user of a plant, not just those sharing a target
+        involved = set(dots)
+        for neighbours in dots.values():
+            involved.update(neighbours)
+        for _, plant_pk, weight in _collection_rows(plant_id__in=involved):
+            norms[plant_pk] += weight * weight
+
+    return {
+        plant_pk: {
+            other_pk: dot / math.sqrt(norms[plant_pk] * norms[other_pk])
+            for other_pk, dot in neighbours.items()
+        }
+        for plant_pk, neighbours in dots.items()
+    }
+
+
+def _top_k(scores: Dict[int, float], k: int) -> List[Tuple[int, float]]:
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+def update_plant_similarities(full: bool = False) -> int:
+    """
+    Refresh stored neighbours from the collection table.
+
+    Returns the number of plants whose neighbour lists were rewritten.
+    """
+    from apps.accounts.models import UserPlantCollection
+
+    k = settings.PLANT_SIMILARITY_NEIGHBOURS
+    watermark = None if full else get_watermark()
+
+    changed = UserPlantCollection.objects.all()
+    if watermark is not None:
+        changed = changed.filter(updated_at__gt=watermark)
+    new_watermark = changed.aggregate(watermark=Max('updated_at'))['watermark']
+    if new_watermark is None and not full:
+        return 0
+
+    if watermark is None:
+        similarities = compute_similarities()
+        neighbours = {plant_pk: _top_k(scores, k) for plant_pk, scores in similarities.items()}
+    else:
+        targets = set(changed.order_by().values_list('plant_id', flat=True).distinct())
+        similarities = compute_similarities(targets)
+        neighbours = {plant_pk: _top_k(similarities.get(plant_pk, {}), k) for plant_pk in targets}
+
+        # Patch the lists of plants that co-occur with a changed plant
+        others = {
+            other_pk
+            for scores in similarities.values()
+            for other_pk in scores
+        } - targets
+        existing = defaultdict(dict)
+        stored = PlantSimilarity.objects.filter(plant_id__in=others).values_list(
+            'plant_id', 'similar_plant_id', 'score'
+        )
+        for plant_pk, other_pk, score in stored:
+            if other_pk not in targets:
+                existing[plant_pk][other_pk] = score
+        for plant_pk in others:
+            scores = existing[plant_pk]
+            for target_pk in targets:
+                score = similarities.get(target_pk, {}).get(plant_pk)
+                if score:
+                    scores[target_pk] = score
+            neighbours[plant_pk] = _top_k(scores, k)
+
+    new_watermark = new_watermark or watermark
+    rows = [
+        PlantSimilarity(
+            plant_id=plant_pk,
+            similar_plant_id=other_pk,
+            score=round(score, 6),
+            rank=rank,
+            watermark=new_watermark,
+        )
+        for plant_pk, ranked in neighbours.items()
+        for rank, (other_pk, score) in enumerate(ranked, start=1)
+    ]
+
+    with transaction.atomic():
+        if watermark is None:
+            PlantSimilarity.objects.all().delete()
+        else:
+            PlantSimilarity.objects.filter(plant_id__in=neighbours).delete()
+        PlantSimilarity.objects.bulk_create(rows, batch_size=1000)
+        # Plant pages (and their cached copies) show the neighbours
+        transaction.on_commit(bump_catalog_version)
+
+    logger.info(f"Rewrote similar plants for {len(neighbours)} plants ({len(rows)} rows)")
+    return len(neighbours)
+
+
+def similar_plants(plant: Plant, limit: int = 6) -> List[Plant]:
+    """
+    Stored neighbours of a plant, best first, annotated with ``similarity_score``.
+
+    A single query on the (plant, rank) index, cached per catalog version.
+    """
+    return cached_catalog(
+        ('similar_plants', plant.pk, limit),
+        lambda: list(
+            Plant.objects.filter(similar_to__plant_id=plant.pk, is_active=True)
+            .annotate(similarity_score=F('similar_to__score'))
+            .order_by('similar_to__rank')[:limit]
+        ),
+    )
@@ -0,0 +1,100 @@
+"""
+Typeahead suggestions for plant names.
+
+A sorted list of normalized name keys is searched with ``bisect``, so a
+lookup costs O(log n) plus a bounded scan of neighbouring keys and never
+touches the database. The index is rebuilt when the catalog version moves.
+"""
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Tuple
+
+from django.urls import reverse
+
+from .cache import CatalogIndex
+from .matching import normalize_name
+from .models import Plant
+
+# Keys examined per lookup; bounds latency for very short prefixes
+MAX_SCAN = 256
+
+# Match quality, best first
+NAME_PREFIX = 0
+SCIENTIFIC_PREFIX = 1
+WORD_PREFIX = 2
+
+
+class Suggestion(NamedTuple):
+    id: int
+    name: str
+    scientific_name: str
+    url: str
+
+
+class _Entry(NamedTuple):
+    id: int
+    name: str
+    scientific_name: str
+    slug: str
+
+
+class PrefixIndex:
+    """
+    Sorted (key, kind, entry) triples over common and scientific names.
+
+    Besides the full names, every later word of a name is indexed as well,
+    so "plant" suggests "Snake Plant" (ranked after names starting with it).
+    """
+
+    def __init__(self, plants):
+        self.entries: List[_Entry] = []
+        keys: List[Tuple[str, int, int]] = []
+        for pk, name, scientific_name, slug in plants:
+            entry = len(self.entries)
+            self.entries.append(_Entry(pk, name, scientific_name, slug))
+            for text, kind in ((name, NAME_PREFIX), (scientific_name, SCIENTIFIC_PREFIX)):
+                words = normalize_name(text).split()
+                for i in range(len(words)):
+                    keys.append((' '.join(words[i:]), kind if i == 0 else WORD_PREFIX, entry))
+        keys.sort()
+        self.keys = [key for key, _, _ in keys]
+        self.matches = [(kind, entry) for _, kind, entry in keys]
+
+    @classmethod
+    def build(cls) -> 'PrefixIndex':
+        plants = Plant.objects.filter(is_active=True).order_by('name', 'pk').values_list(
+            'pk', 'name', 'scientific_name', 'slug'
+        )
+        return cls(plants.iterator())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """Return up to ``limit`` plants whose names start with ``prefix``."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        best: Dict[int, int] = {}
+        start = bisect_left(self.keys, prefix)
+        for i in range(start, min(start + MAX_SCAN, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            kind, entry = self.matches[i]
+            if kind < best.get(entry, WORD_PREFIX + 1):
+                best[entry] = kind
+
+        ranked = sorted(best, key=lambda entry: (best[entry], len(self.entries[entry].name), entry))
+        # URLs are only resolved for the handful of plants returned
+        return [
+            Suggestion(
+                id=self.entries[entry].id,
+                name=self.entries[entry].name,
+                scientific_name=self.entries[entry].scientific_name,
+                url=reverse('plants:detail', kwargs={'slug': self.entries[entry].slug}),
+            )
+            for entry in ranked[:limit]
+        ]
+
+
+suggestion_index: CatalogIndex[PrefixIndex] = CatalogIndex(PrefixIndex.build)
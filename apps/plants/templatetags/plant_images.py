@@ -0,0 +1,42 @@
+"""
+Template tags for sized plant images.
+"""
+from django import template
+from django.utils.html import format_html
+
+from apps.plants.renditions import ImageSource, rendition_box
+
+register = template.Library()
+
+
+def _source(image):
+    return image if isinstance(image, ImageSource) else ImageSource(image or '')
+
+
+@register.filter
+def rendition(image, size):
+    """URL of an image at a named size: ``{{ plant.primary_image|rendition:'card' }}``."""
+    return _source(image).rendition(size)
+
+
+@register.simple_tag
+def plant_picture(image, size, alt='', css_class='', sizes='', style=''):
+    """
+    A ``<picture>`` of an image at a named size: WebP renditions with a JPEG
+    fallback, 1x and 2x each, lazily loaded.
+
+    Usage: ``{% plant_picture plant.primary_image 'card' alt=plant.name css_class='card-img-top' %}``
+    """
+    source = _source(image)
+    if not source:
+        return ''
+    width, height = rendition_box(size)
+    sizes = sizes or f'{width}px'
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" style="{}" loading="lazy" decoding="async">'
+        '</picture>',
+        source.srcset(size, 'webp'), sizes,
+        source.rendition(size), source.srcset(size), sizes, width, height, alt, css_class, style,
+    )
@@ -0,0 +1,14 @@
+"""
+Template filters for plant search results.
+"""
+from django import template
+
+from apps.plants.search import highlight_html
+
+register = template.Library()
+
+
+@register.filter
+def search_highlight(value):
+    """Render a search snippet with its matches wrapped in <mark>."""
+    return highlight_html(value)
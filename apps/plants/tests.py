@@ -0,0 +1,54 @@
+"""
+Tests for the plants app.
+"""
+import csv
+import os
+import tempfile
+
+from django.test import TestCase
+
+from .importer import CSV_COLUMNS, CatalogImporter, read_csv
+from .models import Plant, PlantCareGuide
+
+
+class CatalogImportTests(TestCase):
+    """Re-importing the catalog CSV."""
+
+    def setUp(self):
+        self.row = {column: '' for column in CSV_COLUMNS}
+        self.row.update(
+            plant_id='mint',
+            name='Mint',
+            scientific_name='Mentha',
+            care_level='Beginner',
+            space='Windowsill',
+            common_issues='Yellow leaves from overwatering.',
+        )
+
+    def sync(self, **changes):
+        """Write the row, with ``changes``, to a CSV and sync the catalog from it."""
+        self.row.update(changes)
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerow(self.row)
+        return CatalogImporter(sync=True).run(read_csv(path))
+
+    def test_changed_row_rewrites_care_guide(self):
+        self.sync()
+        self.sync(common_issues='Rust spots on the leaves.')
+
+        plant = Plant.objects.select_related('care_guide').get(plant_id='mint')
+        self.assertEqual(plant.common_issues, 'Rust spots on the leaves.')
+        self.assertEqual(plant.care_guide.pro_tips, 'Best grown in windowsill. Rust spots on the leaves.')
+
+    def test_changed_row_keeps_care_calendar(self):
+        self.sync()
+        PlantCareGuide.objects.filter(plant__plant_id='mint').update(may_care='Pinch off flowers.')
+
+        stats = self.sync(common_issues='Rust spots on the leaves.')
+
+        self.assertEqual(stats.updated, 1)
+        self.assertEqual(Plant.objects.get(plant_id='mint').care_guide.may_care, 'Pinch off flowers.')
@@ -1,12 +1,19 @@
 """
 Views for the plants app.
 """
+from django.http import Http404
 from django.views.generic import ListView, DetailView
-from django.db.models import Q
-from .models import Plant, PlantCategory
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPaginationMixin
+from .cache import get_catalog_version, plant_change_state
+from .catalog import get_categories, get_category, get_plant
+from .facets import apply_facet_filters, facet_filters, plant_facets
+from .models import Plant
+from .search import search_plants
+from .similarity import similar_plants
 
 
-class PlantListView(ListView):
+class PlantListView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """
     List view for all plants with search and filtering.
     """
@@ -15,39 +22,35 @@ class PlantListView(ListView):
     context_object_name = 'plants'
     paginate_by = 12
     
+    def get_validators(self):
+        return (get_catalog_version(), self.request.get_full_path()), None
+    
     def get_queryset(self):
         queryset = Plant.objects.filter(is_active=True).select_related().prefetch_related('categories')
         
-        # Search functionality
+        # Filter by sunlight, space, care level and category
+        self.filters = facet_filters(self.request.GET)
+        queryset = apply_facet_filters(queryset, self.filters)
+        
+        # Full-text search, ranked by relevance
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | 
-                Q(scientific_name__icontains=search) |
-                Q(tagline__icontains=search)
-            )
-        
-        # Filter by care level
-        care_level = self.request.GET.get('care_level')
-        if care_level:
-            queryset = queryset.filter(care_level__icontains=care_level)
-        
-        # Filter by sunlight
-        sunlight = self.request.GET.get('sunlight')
-        if sunlight:
-            queryset = queryset.filter(sunlight=sunlight)
+            return search_plants(queryset, search)
         
         return queryset.order_by('name')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = PlantCategory.objects.all()
+        context['categories'] = get_categories()
         context['sunlight_choices'] = Plant.SUNLIGHT_CHOICES
         context['care_level_choices'] = Plant.CARE_LEVEL_CHOICES
+        context['search'] = self.request.GET.get('search', '')
+        context['filters'] = self.filters
+        context['facets'] = plant_facets(self.filters, context['search'])
         return context
 
 
-class PlantDetailView(DetailView):
+class PlantDetailView(ConditionalGetMixin, DetailView):
     """
     Detail view for individual plants.
     """
@@ -56,11 +59,26 @@ class PlantDetailView(DetailView):
     context_object_name = 'plant'
     slug_field = 'slug'
     
+    def get_validators(self):
+        return plant_change_state(slug=self.kwargs['slug'])
+    
     def get_queryset(self):
         return Plant.objects.filter(is_active=True).select_related('care_guide').prefetch_related('categories', 'additional_images')
+    
+    def get_object(self, queryset=None):
+        plant = get_plant(self.kwargs['slug'])
+        if plant is None:
+            raise Http404("No plant found matching the query")
+        return plant
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # "People who grew this also grew", precomputed offline
+        context['similar_plants'] = similar_plants(self.object, limit=6)
+        return context
 
 
-class PlantCategoryView(ListView):
+class PlantCategoryView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     """
     List plants by category.
     """
@@ -69,6 +87,9 @@ class PlantCategoryView(ListView):
     context_object_name = 'plants'
     paginate_by = 12
     
+    def get_validators(self):
+        return (get_catalog_version(), self.request.get_full_path()), None
+    
     def get_queryset(self):
         category_slug = self.kwargs['slug']
         return Plant.objects.filter(
@@ -78,9 +99,5 @@ class PlantCategoryView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        category_slug = self.kwargs['slug']
-        try:
-            context['category'] = PlantCategory.objects.get(slug=category_slug)
-        except PlantCategory.DoesNotExist:
-            context['category'] = None
+        context['category'] = get_category(self.kwargs['slug'])
         return context
@@ -0,0 +1,351 @@
+"""
+HTTP client for the Plant.id API.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Upstream responses that are worth retrying and that count against the breaker
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling Plant.id while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker shared by all workers in a process.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. A single trial call is then
+    let through; success closes the circuit, failure opens it again. A trial
+    that never reports back (e.g. its worker died) is given up on after
+    another ``reset_timeout`` seconds and a new one is let through.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Return True if a call to the upstream may be attempted."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN:
+                now = time.monotonic()
+                if self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout:
+                    self._trial_started_at = now
+                    return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started_at = None
+
+    def release_trial(self) -> None:
+        """Give up a half-open trial without a verdict (e.g. it was cancelled)."""
+        with self._lock:
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_started_at = None
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        f"Plant.id circuit opened after {self._failures} consecutive failures"
+                    )
+                self._opened_at = time.monotonic()
+
+
+class CappedRetry(Retry):
+    """Retry that waits at most ``max_retry_after`` seconds for a Retry-After header."""
+
+    def __init__(self, *args, max_retry_after: float = 10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kwargs) -> 'CappedRetry':
+        kwargs.setdefault('max_retry_after', self.max_retry_after)
+        return super().new(**kwargs)
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), self.max_retry_after)
+
+
+class PlantIdClient:
+    """
+    Keep-alive Plant.id client with a shared connection pool.
+
+    Transient upstream errors (429/5xx, dropped connections) are retried with
+    jittered exponential backoff before the circuit breaker records a failure.
+    A Retry-After header is honoured up to ``max_retry_after`` seconds, so
+    an upstream asking for a long pause cannot hold a worker for it.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 30,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        pool_size: int = 10,
+        max_retry_after: float = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_url = api_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=60)
+        self.session = self._build_session(api_key, max_retries, backoff_factor, pool_size, max_retry_after)
+
+    @classmethod
+    def from_settings(cls) -> 'PlantIdClient':
+        return cls(
+            api_url=settings.PLANT_ID_API_URL,
+            api_key=settings.PLANT_ID_API_KEY,
+            connect_timeout=settings.PLANT_ID_CONNECT_TIMEOUT,
+            read_timeout=settings.PLANT_ID_READ_TIMEOUT,
+            max_retries=settings.PLANT_ID_MAX_RETRIES,
+            backoff_factor=settings.PLANT_ID_BACKOFF_FACTOR,
+            pool_size=settings.PLANT_ID_POOL_SIZE,
+            max_retry_after=settings.PLANT_ID_MAX_RETRY_AFTER,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.PLANT_ID_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.PLANT_ID_CIRCUIT_RESET_TIMEOUT,
+            ),
+        )
+
+    def _build_session(self, api_key, max_retries, backoff_factor, pool_size, max_retry_after) -> requests.Session:
+        retry = CappedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True,
+            max_retry_after=max_retry_after,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Api-Key': api_key,
+            'Content-Type': 'application/json',
+        })
+        return session
+
+    def identify(self, payload: Dict) -> Dict:
+        """
+        POST an identification payload and return the decoded JSON body.
+
+        Raises:
+            CircuitOpenError: if the upstream is currently considered down
+            requests.exceptions.RequestException: on any other request failure
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("Plant.id circuit breaker is open")
+
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            # Client errors (bad image, auth) say nothing about upstream health
+            if e.response is not None and e.response.status_code not in RETRY_STATUS_CODES:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+        except requests.exceptions.RequestException:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return response.json()
+
+
+class AsyncPlantIdClient:
+    """
+    Asyncio Plant.id client for ASGI views.
+
+    Mirrors PlantIdClient: one pooled httpx.AsyncClient per event loop,
+    separate connect/read timeouts, jittered exponential backoff on 429/5xx
+    and the same circuit breaker. Failures are raised as requests exceptions
+    so callers share the synchronous fallback handling.
+
+    Connections are only reused under ASGI, where every request runs on the
+    server's one event loop. Under WSGI each async view call gets an event
+    loop of its own, so its client lives for that request and is closed
+    when the loop shuts down.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 30,
+        max_retries: int = 2,
+        backoff_factor: float = 0.5,
+        pool_size: int = 100,
+        max_retry_after: float = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_after = max_retry_after
+        self.breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout=60)
+        # Event loop -> (client, generator that closes it when the loop shuts down)
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncIterator]] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'AsyncPlantIdClient':
+        return cls(
+            api_url=settings.PLANT_ID_API_URL,
+            api_key=settings.PLANT_ID_API_KEY,
+            connect_timeout=settings.PLANT_ID_CONNECT_TIMEOUT,
+            read_timeout=settings.PLANT_ID_READ_TIMEOUT,
+            max_retries=settings.PLANT_ID_MAX_RETRIES,
+            backoff_factor=settings.PLANT_ID_BACKOFF_FACTOR,
+            pool_size=settings.PLANT_ID_ASYNC_POOL_SIZE,
+            max_retry_after=settings.PLANT_ID_MAX_RETRY_AFTER,
+            # Share breaker state with the synchronous client
+            breaker=get_plant_id_client().breaker,
+        )
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # httpx connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            # Their clients were closed when the loops shut down
+            for stale_loop in [l for l in self._clients if l.is_closed()]:
+                del self._clients[stale_loop]
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    'Api-Key': self.api_key,
+                    'Content-Type': 'application/json',
+                },
+            )
+            closer = self._close_at_shutdown(client)
+            await closer.__anext__()
+            self._clients[loop] = (client, closer)
+        return self._clients[loop][0]
+
+    @staticmethod
+    async def _close_at_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+        """
+        Suspended until the loop finalizes unfinished async generators on
+        shutdown (asyncio.run() and async_to_sync() both do), then closes
+        ``client`` while the loop can still run it.
+        """
+        try:
+            yield
+        finally:
+            await client.aclose()
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_retry_after)
+        return self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_factor)
+
+    async def identify(self, payload: Dict) -> Dict:
+        """
+        POST an identification payload and return the decoded JSON body.
+
+        Raises:
+            CircuitOpenError: if the upstream is currently considered down
+            requests.exceptions.RequestException: on any other request failure
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("Plant.id circuit breaker is open")
+
+        client = await self._get_client()
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = None
+                try:
+                    response = await client.post(self.api_url, json=payload)
+                except httpx.TransportError as e:
+                    error = requests.exceptions.ConnectionError(str(e))
+                except httpx.HTTPError as e:
+                    error = requests.exceptions.RequestException(str(e))
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        break
+                    error = requests.exceptions.HTTPError(f"Plant.id returned {response.status_code}")
+
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise error
+                await asyncio.sleep(self._backoff(attempt, response))
+        except BaseException:
+            # Cancelled (client went away) or failed unexpectedly: never keep
+            # the half-open trial slot, or the breaker would stay shut
+            self.breaker.release_trial()
+            raise
+
+        # Client errors (bad image, auth) say nothing about upstream health
+        self.breaker.record_success()
+        if response.is_error:
+            raise requests.exceptions.HTTPError(f"Plant.id returned {response.status_code}")
+        return response.json()
+
+
+@lru_cache(maxsize=None)
+def get_plant_id_client() -> PlantIdClient:
+    """Return the process-wide Plant.id client."""
+    return PlantIdClient.from_settings()
+
+
+@lru_cache(maxsize=None)
+def get_async_plant_id_client() -> AsyncPlantIdClient:
+    """Return the process-wide asyncio Plant.id client."""
+    return AsyncPlantIdClient.from_settings()
@@ -0,0 +1,89 @@
+"""
+Image preprocessing for plant identification uploads.
+"""
+import io
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    'JPEG': 'image/jpeg',
+    'WEBP': 'image/webp',
+}
+
+
+@dataclass
+class PreparedImage:
+    """Re-encoded image bytes ready to be sent upstream."""
+    data: bytes
+    content_type: str
+    original_size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def processed_size(self) -> int:
+        return len(self.data)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_size - self.processed_size
+
+
+def prepare_image(
+    image_data: bytes,
+    max_dimension: Optional[int] = None,
+    quality: Optional[int] = None,
+    image_format: Optional[str] = None,
+) -> PreparedImage:
+    """
+    Downscale and re-encode an uploaded photo before identification.
+
+    The image is rotated according to its EXIF orientation, shrunk so that
+    its longest side is at most ``max_dimension`` pixels and re-encoded as
+    JPEG or WebP. Metadata (EXIF, GPS, ICC) is not carried over. Files that
+    Pillow cannot decode are passed through unchanged.
+    """
+    max_dimension = max_dimension or settings.PLANT_ID_IMAGE_MAX_DIMENSION
+    quality = quality or settings.PLANT_ID_IMAGE_QUALITY
+    image_format = (image_format or settings.PLANT_ID_IMAGE_FORMAT).upper()
+    if image_format not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported image format: {image_format}")
+
+    try:
+        with Image.open(io.BytesIO(image_data)) as image:
+            # Let the JPEG decoder scale down by a power of two while decoding,
+            # which avoids materialising the full-resolution bitmap
+            image.draft('RGB', (max_dimension, max_dimension))
+            image = ImageOps.exif_transpose(image)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+            output = io.BytesIO()
+            image.save(output, format=image_format, quality=quality)
+            prepared = PreparedImage(
+                data=output.getvalue(),
+                content_type=CONTENT_TYPES[image_format],
+                original_size=len(image_data),
+                width=image.width,
+                height=image.height,
+            )
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning(f"Image preprocessing skipped, sending original upload: {e}")
+        return PreparedImage(
+            data=image_data,
+            content_type='application/octet-stream',
+            original_size=len(image_data),
+        )
+
+    logger.info(
+        f"Prepared identification image: {prepared.original_size} -> "
+        f"{prepared.processed_size} bytes ({prepared.width}x{prepared.height} {image_format})"
+    )
+    return prepared
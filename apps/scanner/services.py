@@ -1,15 +1,141 @@
 """
 Plant identification services.
 """
+import asyncio
 import base64
+import hashlib
+import json
 import requests
 import logging
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from apps.plants.catalog import sample_plants
+from apps.plants.matching import plant_name_index
 from apps.plants.models import Plant
+from .client import CircuitOpenError, get_async_plant_id_client, get_plant_id_client
+from .preprocessing import prepare_image
 
 logger = logging.getLogger(__name__)
 
+# Version of the schema stored in PlantIdentificationHistory.api_response
+RESULT_SCHEMA_VERSION = 2
+
+
+class IdentificationResultCache:
+    """
+    Content-addressed cache for processed identification results.
+    
+    Entries are keyed by the SHA-256 digest of the uploaded image bytes, so a
+    retried or double-submitted photo is answered without calling Plant.id.
+    Size-bounded eviction is delegated to the configured cache backend
+    (``MAX_ENTRIES`` on the ``plant_identification`` cache alias).
+    """
+    KEY_PREFIX = 'plant-id:result:'
+    HITS_KEY = 'plant-id:stats:hits'
+    MISSES_KEY = 'plant-id:stats:misses'
+    
+    def __init__(self, alias: Optional[str] = None, timeout: Optional[int] = None):
+        self.cache = caches[alias or settings.PLANT_ID_CACHE_ALIAS]
+        self.timeout = settings.PLANT_ID_CACHE_TTL if timeout is None else timeout
+    
+    @staticmethod
+    def make_key(image_data: bytes) -> str:
+        """Return the content address for a block of image bytes."""
+        return hashlib.sha256(image_data).hexdigest()
+    
+    def get(self, digest: str) -> Optional[List[Dict]]:
+        """Return cached results for an image digest, or None on a miss."""
+        entry = self.cache.get(self.KEY_PREFIX + digest)
+        if entry is None:
+            self._increment(self.MISSES_KEY)
+            return None
+        
+        self._increment(self.HITS_KEY)
+        return self._hydrate(entry)
+    
+    def set(self, digest: str, results: List[Dict]) -> None:
+        """Store processed results for an image digest."""
+        self.cache.set(self.KEY_PREFIX + digest, self._dehydrate(results), self.timeout)
+    
+    async def aget(self, digest: str) -> Optional[List[Dict]]:
+        """Async version of get()."""
+        entry = await self.cache.aget(self.KEY_PREFIX + digest)
+        if entry is None:
+            await self._aincrement(self.MISSES_KEY)
+            return None
+        
+        await self._aincrement(self.HITS_KEY)
+        pks = self._entry_pks(entry)
+        plants = await Plant.objects.filter(is_active=True).ain_bulk(pks) if pks else {}
+        return self._attach_plants(entry, plants)
+    
+    async def aset(self, digest: str, results: List[Dict]) -> None:
+        """Async version of set()."""
+        await self.cache.aset(self.KEY_PREFIX + digest, self._dehydrate(results), self.timeout)
+    
+    def stats(self) -> Dict:
+        """Return hit/miss counters for the result cache."""
+        counters = self.cache.get_many([self.HITS_KEY, self.MISSES_KEY])
+        hits = counters.get(self.HITS_KEY, 0)
+        misses = counters.get(self.MISSES_KEY, 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+    
+    def _increment(self, key: str) -> None:
+        # add() is a no-op when the counter already exists
+        self.cache.add(key, 0, timeout=None)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Counter was evicted between add() and incr()
+            self.cache.set(key, 1, timeout=None)
+    
+    async def _aincrement(self, key: str) -> None:
+        await self.cache.aadd(key, 0, timeout=None)
+        try:
+            await self.cache.aincr(key)
+        except ValueError:
+            await self.cache.aset(key, 1, timeout=None)
+    
+    def _dehydrate(self, results: List[Dict]) -> List[Dict]:
+        """Replace model instances with primary keys before caching."""
+        entries = []
+        for result in results:
+            entry = dict(result)
+            matched_plant = entry.pop('matched_plant', None)
+            entry['matched_plant_pk'] = matched_plant.pk if matched_plant else None
+            entries.append(entry)
+        return entries
+    
+    def _hydrate(self, entries: List[Dict]) -> List[Dict]:
+        """Re-attach matched plants to cached results with a single query."""
+        pks = self._entry_pks(entries)
+        plants = Plant.objects.filter(is_active=True).in_bulk(pks) if pks else {}
+        return self._attach_plants(entries, plants)
+    
+    def _entry_pks(self, entries: List[Dict]) -> List[int]:
+        return [entry['matched_plant_pk'] for entry in entries if entry.get('matched_plant_pk')]
+    
+    def _attach_plants(self, entries: List[Dict], plants: Dict[int, Plant]) -> List[Dict]:
+        results = []
+        for entry in entries:
+            result = dict(entry)
+            matched_plant = plants.get(result.pop('matched_plant_pk', None))
+            result['matched_plant'] = matched_plant
+            result['plant_id'] = matched_plant.plant_id if matched_plant else None
+            results.append(result)
+        return results
+
 
 class PlantIdentificationService:
     """
@@ -19,13 +145,18 @@ class PlantIdentificationService:
     def __init__(self):
         self.api_key = settings.PLANT_ID_API_KEY
         self.api_url = settings.PLANT_ID_API_URL
+        self.result_cache = IdentificationResultCache()
+        self.client = get_plant_id_client()
+        self.async_client = get_async_plant_id_client()
     
-    def identify_plant(self, image_file) -> List[Dict]:
+    def identify_plant(self, image_file, fallback: bool = True) -> List[Dict]:
         """
         Identify a plant from an image file.
         
         Args:
             image_file: Django UploadedFile object
+            fallback: answer upstream failures with mock (or no) results;
+                if False they are raised, so background jobs can fail
             
         Returns:
             List of identification results with confidence scores
@@ -35,62 +166,179 @@ class PlantIdentificationService:
             return self._get_mock_results()
         
         try:
-            # Convert image to base64
             image_data = image_file.read()
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
             
-            # Prepare API request
-            headers = {
-                "Api-Key": self.api_key,
-                "Content-Type": "application/json"
-            }
+            # Serve repeat uploads of the same photo from the result cache
+            cache_key = self.result_cache.make_key(image_data)
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
             
-            payload = {
-                "images": [image_base64],
-                "modifiers": ["crops_fast", "similar_images"],
-                "plant_details": [
-                    "common_names", 
-                    "url", 
-                    "name_authority", 
-                    "wiki_description", 
-                    "taxonomy", 
-                    "synonyms"
-                ]
-            }
+            # Downscale and strip metadata before building the payload
+            prepared = prepare_image(image_data)
+            del image_data
+            payload = self._build_payload(prepared.data)
             
-            # Make API request
-            response = requests.post(
-                self.api_url, 
-                headers=headers, 
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
+            # Make API request over the shared keep-alive session
+            data = self.client.identify(payload)
             
             # Process response
-            data = response.json()
-            return self._process_api_response(data)
+            results = self._process_api_response(data)
+            self.result_cache.set(cache_key, results)
+            return results
             
+        except CircuitOpenError:
+            if not fallback:
+                raise
+            logger.warning("Plant ID API unavailable (circuit open), using mock data")
+            return self._get_mock_results()
         except requests.exceptions.RequestException as e:
+            if not fallback:
+                raise
             logger.error(f"Plant ID API request failed: {e}")
             return self._get_mock_results()
+        except Exception as e:
+            if not fallback:
+                raise
+            logger.error(f"Plant identification error: {e}")
+            return []
+    
+    async def aidentify_plant(self, image_file) -> List[Dict]:
+        """
+        Async version of identify_plant() for ASGI views.
+        
+        The upstream call is awaited on the shared httpx pool, CPU-bound image
+        preprocessing runs in a worker thread and database reads use the async
+        ORM, so no thread is held for the duration of the request.
+        """
+        if not self.api_key:
+            logger.warning("Plant ID API key not configured, using mock data")
+            return await self._aget_mock_results()
+        
+        try:
+            image_data = image_file.read()
+            
+            # Serve repeat uploads of the same photo from the result cache
+            cache_key = self.result_cache.make_key(image_data)
+            cached_results = await self.result_cache.aget(cache_key)
+            if cached_results is not None:
+                return cached_results
+            
+            prepared = await sync_to_async(prepare_image, thread_sensitive=False)(image_data)
+            del image_data
+            payload = self._build_payload(prepared.data)
+            
+            data = await self.async_client.identify(payload)
+            
+            results = await self._aprocess_api_response(data)
+            await self.result_cache.aset(cache_key, results)
+            return results
+            
+        except CircuitOpenError:
+            logger.warning("Plant ID API unavailable (circuit open), using mock data")
+            return await self._aget_mock_results()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Plant ID API request failed: {e}")
+            return await self._aget_mock_results()
         except Exception as e:
             logger.error(f"Plant identification error: {e}")
             return []
     
+    def identify_plants(self, image_files, max_concurrency: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Identify several images concurrently.
+        
+        Each image is identified separately (a multi-image Plant.id request
+        describes a single plant), with at most ``max_concurrency`` upstream
+        calls in flight. Results are returned in the order of ``image_files``.
+        """
+        max_concurrency = max_concurrency or settings.PLANT_ID_BATCH_CONCURRENCY
+        if len(image_files) <= 1:
+            return [self.identify_plant(image_file) for image_file in image_files]
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(image_files))) as pool:
+            return list(pool.map(self._identify_in_worker, image_files))
+    
+    def _identify_in_worker(self, image_file) -> List[Dict]:
+        try:
+            return self.identify_plant(image_file)
+        finally:
+            # Worker threads get their own DB connections; don't leak them
+            connections.close_all()
+    
+    async def aidentify_plants(self, image_files, max_concurrency: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Async version of identify_plants().
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.PLANT_ID_BATCH_CONCURRENCY)
+        
+        async def identify(image_file):
+            async with semaphore:
+                return await self.aidentify_plant(image_file)
+        
+        return await asyncio.gather(*(identify(image_file) for image_file in image_files))
+    
+    def _build_payload(self, image_data: bytes) -> Dict:
+        """
+        Build the Plant.id request body for a prepared image.
+        """
+        # Convert image to base64
+        image_base64 = base64.b64encode(image_data).decode('utf-8')
+        
+        return {
+            "images": [image_base64],
+            "modifiers": ["crops_fast", "similar_images"],
+            "plant_details": [
+                "common_names", 
+                "url", 
+                "name_authority", 
+                "wiki_description", 
+                "taxonomy", 
+                "synonyms"
+            ]
+        }
+    
     def _process_api_response(self, data: Dict) -> List[Dict]:
         """
         Process the Plant.id API response into our format.
         """
-        results = []
-        suggestions = data.get('suggestions', [])
+        suggestions = data.get('suggestions', [])[:5]  # Top 5 results
         
-        for suggestion in suggestions[:5]:  # Top 5 results
+        # Resolve every suggestion against the in-memory name index, then
+        # load the matched plants with a single query
+        matches = self._match_suggestions(plant_name_index.get(), suggestions)
+        plants = Plant.objects.in_bulk([pk for pk, _ in matches if pk])
+        return self._build_results(suggestions, matches, plants)
+    
+    async def _aprocess_api_response(self, data: Dict) -> List[Dict]:
+        """
+        Async version of _process_api_response().
+        """
+        suggestions = data.get('suggestions', [])[:5]
+        
+        index = await sync_to_async(plant_name_index.get)()
+        matches = self._match_suggestions(index, suggestions)
+        plants = await Plant.objects.ain_bulk([pk for pk, _ in matches if pk])
+        return self._build_results(suggestions, matches, plants)
+    
+    def _match_suggestions(self, index, suggestions: List[Dict]) -> List:
+        """
+        Resolve each suggestion to a (plant pk, match score) pair.
+        """
+        return [
+            index.resolve(self._candidate_terms(suggestion.get('plant_name', 'Unknown'), suggestion))
+            for suggestion in suggestions
+        ]
+    
+    def _build_results(self, suggestions: List[Dict], matches: List, plants: Dict[int, Plant]) -> List[Dict]:
+        """
+        Combine suggestions and their matched plants into our result format.
+        """
+        results = []
+        for suggestion, (matched_pk, match_score) in zip(suggestions, matches):
             plant_name = suggestion.get('plant_name', 'Unknown')
             probability = suggestion.get('probability', 0.0)
-            
-            # Try to find matching plant in our database
-            matched_plant = self._find_matching_plant(plant_name, suggestion)
+            matched_plant = plants.get(matched_pk)
             
             result = {
                 'plant_name': plant_name,
@@ -98,6 +346,7 @@ class PlantIdentificationService:
                 'scientific_name': self._extract_scientific_name(suggestion),
                 'confidence': probability,
                 'matched_plant': matched_plant,
+                'match_score': match_score if matched_plant else 0.0,
                 'plant_id': matched_plant.plant_id if matched_plant else None,
                 'api_data': suggestion  # Store full API response
             }
@@ -105,15 +354,14 @@ class PlantIdentificationService:
         
         return results
     
-    def _find_matching_plant(self, plant_name: str, suggestion: Dict) -> Optional[Plant]:
+    def _candidate_terms(self, plant_name: str, suggestion: Dict) -> List[str]:
         """
-        Try to find a matching plant in our database.
+        Names from a suggestion to look up in our database, in priority order.
         """
-        # Extract possible names to search for
         search_terms = [plant_name]
         
         # Add common names from API
-        common_names = suggestion.get('plant_details', {}).get('common_names', [])
+        common_names = suggestion.get('plant_details', {}).get('common_names') or []
         search_terms.extend(common_names)
         
         # Add scientific name
@@ -121,36 +369,7 @@ class PlantIdentificationService:
         if scientific_name:
             search_terms.append(scientific_name)
         
-        # Search our database
-        for term in search_terms:
-            if not term:
-                continue
-                
-            # Try exact name match
-            plant = Plant.objects.filter(
-                name__iexact=term,
-                is_active=True
-            ).first()
-            if plant:
-                return plant
-            
-            # Try scientific name match
-            plant = Plant.objects.filter(
-                scientific_name__iexact=term,
-                is_active=True
-            ).first()
-            if plant:
-                return plant
-            
-            # Try partial name match
-            plant = Plant.objects.filter(
-                name__icontains=term,
-                is_active=True
-            ).first()
-            if plant:
-                return plant
-        
-        return None
+        return search_terms
     
     def _extract_common_name(self, plant_name: str) -> str:
         """Extract common name from plant name string."""
@@ -177,8 +396,15 @@ class PlantIdentificationService:
         Return mock results for development/demo purposes.
         """
         # Get some sample plants from our database
-        sample_plants = Plant.objects.filter(is_active=True)[:3]
-        
+        return self._build_mock_results(sample_plants(3))
+    
+    async def _aget_mock_results(self) -> List[Dict]:
+        """
+        Async version of _get_mock_results().
+        """
+        return self._build_mock_results(await sync_to_async(sample_plants)(3))
+    
+    def _build_mock_results(self, sample_plants) -> List[Dict]:
         mock_results = []
         confidences = [0.89, 0.76, 0.65]
         
@@ -192,6 +418,7 @@ class PlantIdentificationService:
                 'scientific_name': plant.scientific_name,
                 'confidence': confidences[i],
                 'matched_plant': plant,
+                'match_score': 1.0,
                 'plant_id': plant.plant_id,
                 'api_data': {
                     'plant_name': plant.name,
@@ -204,3 +431,74 @@ class PlantIdentificationService:
             mock_results.append(result)
         
         return mock_results
+
+
+def compact_result(result: Dict) -> Dict:
+    """
+    Storage form of an identification result: plant primary key, no upstream data.
+    """
+    plant = result.get('matched_plant')
+    return {
+        'plant_name': result.get('plant_name'),
+        'common_name': result.get('common_name'),
+        'scientific_name': result.get('scientific_name'),
+        'confidence': result.get('confidence', 0.0),
+        'match_score': result.get('match_score', 0.0),
+        'plant': plant.pk if plant else None,
+    }
+
+
+def apply_identification_results(history, results: List[Dict]) -> None:
+    """
+    Copy identification results onto a PlantIdentificationHistory instance.
+    
+    Only the top ``PLANT_ID_STORED_RESULTS`` results are kept, in compact
+    form. The upstream payload is stored zlib-compressed in ``raw_response``
+    when ``PLANT_ID_STORE_RAW_RESPONSE`` is enabled. The instance is not saved.
+    """
+    if not results:
+        return
+    
+    stored = [compact_result(result) for result in results[:settings.PLANT_ID_STORED_RESULTS]]
+    history.api_response = {
+        'version': RESULT_SCHEMA_VERSION,
+        'best_match': stored[0],
+        'results': stored
+    }
+    history.confidence_score = results[0].get('confidence', 0.0)
+    
+    if settings.PLANT_ID_STORE_RAW_RESPONSE:
+        raw = [result['api_data'] for result in results if result.get('api_data')]
+        history.raw_response = zlib.compress(json.dumps(raw).encode()) if raw else None
+    
+    # Try to match with our plant database
+    matched_plant = results[0].get('matched_plant')
+    if matched_plant:
+        history.identified_plant = matched_plant
+
+
+def serialize_result(result: Dict) -> Dict:
+    """
+    JSON-safe representation of a single identification result.
+    """
+    plant = result.get('matched_plant')
+    return {
+        'plant_name': result.get('plant_name'),
+        'common_name': result.get('common_name'),
+        'scientific_name': result.get('scientific_name'),
+        'confidence': result.get('confidence', 0.0),
+        'match_score': result.get('match_score', 0.0),
+        'plant': {
+            'id': plant.pk,
+            'plant_id': plant.plant_id,
+            'name': plant.name,
+            'slug': plant.slug,
+            'url': plant.get_absolute_url(),
+        } if plant else None,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_identification_service() -> PlantIdentificationService:
+    """Return the process-wide identification service."""
+    return PlantIdentificationService()
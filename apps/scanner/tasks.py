@@ -0,0 +1,106 @@
+"""
+Background identification jobs for the scanner app.
+
+Uploads are stored as pending PlantIdentificationHistory rows and identified
+on a process-local thread pool, so request threads return immediately. The
+row's ``status`` column is the job state that clients poll.
+
+Jobs queued in a worker process that exits (restart, ``max_requests``
+recycling) are lost from its pool; ``recover_identifications`` (run by
+``manage.py recover_identifications``) queues such stale jobs again and
+fails the ones too old to be worth finishing.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from typing import List, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.accounts.models import PlantIdentificationHistory
+from .services import apply_identification_results, get_identification_service
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide identification worker pool."""
+    return ThreadPoolExecutor(
+        max_workers=settings.PLANT_ID_WORKER_THREADS,
+        thread_name_prefix='plant-id',
+    )
+
+
+def enqueue_identification(history_id: int) -> None:
+    """Schedule identification of a pending history row after commit."""
+    transaction.on_commit(lambda: get_executor().submit(run_identification, history_id))
+
+
+def run_identification(history_id: int) -> None:
+    """
+    Identify the image of a pending history row and store the results.
+    """
+    close_old_connections()
+    try:
+        # Claim the job; a row that is no longer pending was already picked up
+        claimed = PlantIdentificationHistory.objects.filter(
+            pk=history_id,
+            status='pending'
+        ).update(status='processing', claimed_at=timezone.now())
+        if not claimed:
+            return
+        
+        history = PlantIdentificationHistory.objects.get(pk=history_id)
+        with history.image.open('rb') as image_file:
+            # Upstream failures fail the job instead of storing mock results
+            results = get_identification_service().identify_plant(image_file, fallback=False)
+        
+        apply_identification_results(history, results)
+        history.status = 'completed'
+        history.processed_at = timezone.now()
+        history.save(update_fields=[
+            'api_response', 'raw_response', 'confidence_score',
+            'identified_plant', 'status', 'processed_at'
+        ])
+    except Exception as e:
+        logger.error(f"Background identification {history_id} failed: {e}")
+        PlantIdentificationHistory.objects.filter(pk=history_id).update(
+            status='failed',
+            processed_at=timezone.now()
+        )
+    finally:
+        close_old_connections()
+
+
+def recover_identifications() -> Tuple[List[int], int]:
+    """
+    Reset stale jobs to pending: pending ones created, and processing ones
+    claimed, more than ``PLANT_ID_JOB_STALE_AFTER`` seconds ago. Jobs
+    created more than ``PLANT_ID_JOB_EXPIRE_AFTER`` seconds ago are failed.
+
+    Returns:
+        (pks of the jobs to run again, number of jobs failed)
+    """
+    now = timezone.now()
+    unfinished = PlantIdentificationHistory.objects.filter(status__in=['pending', 'processing'])
+    expired = unfinished.filter(
+        created_at__lt=now - timedelta(seconds=settings.PLANT_ID_JOB_EXPIRE_AFTER)
+    ).update(status='failed', processed_at=now)
+    stale_before = now - timedelta(seconds=settings.PLANT_ID_JOB_STALE_AFTER)
+    stale = PlantIdentificationHistory.objects.filter(
+        Q(status='pending', created_at__lt=stale_before) |
+        # A job that is still being worked on was claimed recently, however old it is;
+        # rows claimed before claimed_at was recorded have none
+        Q(status='processing', claimed_at__lt=stale_before) |
+        Q(status='processing', claimed_at__isnull=True, created_at__lt=stale_before)
+    )
+    with transaction.atomic():
+        pks = list(stale.select_for_update().values_list('pk', flat=True))
+        PlantIdentificationHistory.objects.filter(pk__in=pks).update(status='pending')
+    if pks or expired:
+        logger.warning(f"Recovered {len(pks)} stale identification jobs, failed {expired} expired ones")
+    return pks, expired
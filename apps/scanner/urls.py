@@ -9,5 +9,7 @@ app_name = 'scanner'
 urlpatterns = [
     path('', views.PlantScannerView.as_view(), name='scan'),
     path('identify/', views.PlantIdentificationView.as_view(), name='identify'),
+    path('identify/async/', views.AsyncPlantIdentificationView.as_view(), name='identify_async'),
     path('results/<int:pk>/', views.IdentificationResultView.as_view(), name='results'),
+    path('results/<int:pk>/status/', views.IdentificationStatusView.as_view(), name='status'),
 ]
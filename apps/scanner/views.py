@@ -1,15 +1,28 @@
 """
 Views for the scanner app.
 """
-from django.views.generic import TemplateView, CreateView, DetailView
+from django import forms
+from django.conf import settings
+from django.views.generic import TemplateView, CreateView, DetailView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
-from django.urls import reverse_lazy
-from .services import PlantIdentificationService
+from django.urls import reverse, reverse_lazy
+from .services import apply_identification_results, get_identification_service
+from .tasks import enqueue_identification
 from apps.accounts.models import PlantIdentificationHistory
 
 
+class PlantIdentificationForm(forms.ModelForm):
+    """
+    Upload form for plant identification.
+    """
+    class Meta:
+        model = PlantIdentificationHistory
+        fields = ['image']
+
+
 class PlantScannerView(TemplateView):
     """
     Plant scanner page - equivalent to Streamlit scanner page.
@@ -30,26 +43,23 @@ class PlantIdentificationView(CreateView):
         # Demo mode - no user required
         form.instance.user = None
         
+        if settings.PLANT_ID_ASYNC:
+            # Save the upload as a pending job and let a worker identify it
+            form.instance.status = 'pending'
+            form.instance.api_response = {}
+            super().form_valid(form)
+            enqueue_identification(self.object.pk)
+            return redirect('scanner:results', pk=self.object.pk)
+        
         # Get the uploaded image
         image_file = form.cleaned_data['image']
         
         # Identify the plant
-        service = PlantIdentificationService()
+        service = get_identification_service()
         results = service.identify_plant(image_file)
         
         # Store the results
-        if results:
-            best_result = results[0]
-            form.instance.api_response = {
-                'results': results,
-                'best_match': best_result
-            }
-            form.instance.confidence_score = best_result.get('confidence', 0.0)
-            
-            # Try to match with our plant database
-            matched_plant = best_result.get('matched_plant')
-            if matched_plant:
-                form.instance.identified_plant = matched_plant
+        apply_identification_results(form.instance, results)
         
         response = super().form_valid(form)
         
@@ -60,6 +70,31 @@ class PlantIdentificationView(CreateView):
         return response
 
 
+class AsyncPlantIdentificationView(View):
+    """
+    Native async variant of PlantIdentificationView for ASGI deployments.
+    
+    The upstream call is awaited instead of blocking a worker thread, so one
+    ASGI worker can hold many identifications in flight.
+    """
+    
+    async def post(self, request):
+        form = PlantIdentificationForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return redirect('scanner:scan')
+        
+        # Demo mode - no user required
+        history = form.save(commit=False)
+        history.user = None
+        
+        service = get_identification_service()
+        results = await service.aidentify_plant(form.cleaned_data['image'])
+        apply_identification_results(history, results)
+        await history.asave()
+        
+        return redirect('scanner:results', pk=history.pk)
+
+
 class IdentificationResultView(DetailView):
     """
     Display plant identification results.
@@ -69,4 +104,31 @@ class IdentificationResultView(DetailView):
     context_object_name = 'identification'
     
     def get_queryset(self):
-        return PlantIdentificationHistory.objects.all()
+        return PlantIdentificationHistory.objects.defer('raw_response').select_related('identified_plant')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['poll_timeout'] = settings.PLANT_ID_JOB_POLL_TIMEOUT
+        return context
+
+
+
+class IdentificationStatusView(View):
+    """
+    Lightweight JSON status of an identification job, for polling.
+    """
+    
+    def get(self, request, pk):
+        job = PlantIdentificationHistory.objects.filter(pk=pk).values(
+            'status', 'confidence_score', 'identified_plant__name'
+        ).first()
+        if job is None:
+            raise Http404("Identification not found")
+        
+        return JsonResponse({
+            'id': pk,
+            'status': job['status'],
+            'confidence_score': job['confidence_score'],
+            'identified_plant': job['identified_plant__name'],
+            'results_url': reverse('scanner:results', kwargs={'pk': pk}),
+        })
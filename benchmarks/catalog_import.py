@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Benchmark reading the plant catalog CSV: startup time, throughput and peak memory.
+
+Each measurement runs in a fresh interpreter, so startup time (Django setup
+plus importing the reader, up to the first parsed row) and peak RSS are
+those of a real import run. Rows are parsed and enriched as the importer
+does it, but not written: the database writes do not depend on the reader.
+
+Measured on data/plants.csv and on a generated file (data/plants.csv rows
+repeated with unique plant_ids). The pandas reader that data_migration.py
+used to have is measured too if pandas is installed.
+
+Usage:
+    python benchmarks/catalog_import.py --rows 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+READERS = ['stream', 'pandas']
+
+
+def setup_django():
+    import django
+
+    sys.path.append(str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zfarming.settings')
+    django.setup()
+
+
+def read_stream(path):
+    from apps.plants.importer import chunked, enrich_chunk, read_csv
+
+    for chunk in chunked(read_csv(path), 1000):
+        yield from enrich_chunk(chunk).records
+
+
+def read_pandas(path):
+    import pandas as pd
+
+    from apps.plants.importer import PlantRow, enrich_row
+
+    for _, row in pd.read_csv(path).iterrows():
+        yield enrich_row(PlantRow(**{name: str(row[name]) for name in PlantRow._fields}))
+
+
+def measure(reader, path):
+    """Run in the child process: read `path` and return the measurements."""
+    start = time.perf_counter()
+    setup_django()
+    rows = iter({'stream': read_stream, 'pandas': read_pandas}[reader](path))
+    count = 1 if next(rows, None) is not None else 0
+    startup = time.perf_counter() - start
+    for _ in rows:
+        count += 1
+    return {
+        'rows': count,
+        'startup': startup,
+        'total': time.perf_counter() - start,
+        # Kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def generate(path, rows):
+    """Write `rows` rows of data/plants.csv, repeated with unique plant_ids."""
+    with open(BASE_DIR / 'data' / 'plants.csv', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        source = list(reader)
+    name, plant_id = header.index('name'), header.index('plant_id')
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for n in range(rows):
+            row = list(source[n % len(source)])
+            row[name] = f'{row[name]} {n}'
+            row[plant_id] = f'{row[plant_id]}_{n}'
+            writer.writerow(row)
+
+
+def pandas_available():
+    result = subprocess.run([sys.executable, '-c', 'import pandas'], capture_output=True)
+    return result.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows in the generated file')
+    parser.add_argument('--output', help='path of the generated file (kept and reused if given)')
+    parser.add_argument('--child', nargs=2, metavar=('READER', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    readers = READERS if pandas_available() else ['stream']
+    with tempfile.TemporaryDirectory() as tmp:
+        generated = Path(args.output or Path(tmp) / 'plants.csv')
+        if not generated.exists():
+            print(f"Generating {args.rows} rows in {generated}...")
+            generate(generated, args.rows)
+
+        print(f"{'file':<24} {'reader':<8} {'rows':>9} {'startup':>9} {'total':>9} {'rows/s':>9} {'peak RSS':>10}")
+        for path in (BASE_DIR / 'data' / 'plants.csv', generated):
+            for reader in readers:
+                output = subprocess.run(
+                    [sys.executable, __file__, '--child', reader, str(path)],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(output.splitlines()[-1])
+                print(
+                    f"{path.name if path != generated else f'generated ({args.rows})':<24} {reader:<8} "
+                    f"{result['rows']:>9} {result['startup'] * 1000:>7.0f}ms {result['total']:>8.2f}s "
+                    f"{result['rows'] / result['total']:>9.0f} {result['peak_rss_mb']:>8.1f}MB"
+                )
+        if 'pandas' not in readers:
+            print("(pandas is not installed; only the streaming reader was measured)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Benchmark concurrent plant identifications: WSGI (threads) vs ASGI (asyncio).
+
+A local fake Plant.id server answers every request after a fixed delay, so
+the numbers isolate how many identifications each path keeps in flight.
+The WSGI path is modelled as a pool of worker threads calling the blocking
+service, the ASGI path as a single event loop awaiting the async service.
+
+Usage:
+    python benchmarks/scanner_concurrency.py --requests 200 --threads 8 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import django
+
+# Setup Django
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'zfarming.settings')
+django.setup()
+
+from django.conf import settings
+from PIL import Image
+
+RESPONSE_BODY = json.dumps({
+    'suggestions': [
+        {'plant_name': 'Mint (Mentha spicata)', 'probability': 0.91},
+        {'plant_name': 'Basil (Ocimum basilicum)', 'probability': 0.42},
+    ]
+}).encode()
+
+
+def start_fake_upstream(delay):
+    """Run a minimal asyncio HTTP server that replies after `delay` seconds."""
+    ready = threading.Event()
+    state = {}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                headers = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in headers.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':')[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(delay)
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(RESPONSE_BODY)).encode() + b'\r\n\r\n'
+                    + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(handle, '127.0.0.1', 0, backlog=1024))
+        state['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return state['port']
+
+
+def make_images(count):
+    """Distinct small JPEGs so the result cache never short-circuits a call."""
+    images = []
+    for i in range(count):
+        output = io.BytesIO()
+        Image.new('RGB', (64, 64), (i % 256, (i // 256) % 256, 120)).save(output, 'JPEG')
+        images.append(output.getvalue())
+    return images
+
+
+def bench_wsgi(service, images, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda data: service.identify_plant(io.BytesIO(data)), images))
+    return time.perf_counter() - start
+
+
+async def bench_asgi(service, images):
+    start = time.perf_counter()
+    await asyncio.gather(*(service.aidentify_plant(io.BytesIO(data)) for data in images))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+    parser.add_argument('--delay', type=float, default=0.5, help='Upstream latency in seconds')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    port = start_fake_upstream(args.delay)
+    settings.PLANT_ID_API_KEY = 'benchmark'
+    settings.PLANT_ID_API_URL = f'http://127.0.0.1:{port}/'
+    settings.PLANT_ID_POOL_SIZE = args.threads
+    settings.PLANT_ID_ASYNC_POOL_SIZE = args.requests
+
+    from apps.scanner.services import get_identification_service
+    service = get_identification_service()
+
+    # Warm the name index and both connection pools
+    service.identify_plant(io.BytesIO(make_images(1)[0] + b'warm-sync'))
+    asyncio.run(service.aidentify_plant(io.BytesIO(make_images(1)[0] + b'warm-async')))
+
+    images = make_images(args.requests * 2)
+    wsgi = bench_wsgi(service, images[:args.requests], args.threads)
+    asgi = asyncio.run(bench_asgi(service, images[args.requests:]))
+
+    print(f"{args.requests} identifications, upstream latency {args.delay:.2f}s")
+    wsgi_label = f"WSGI ({args.threads} threads):"
+    print(f"  {wsgi_label:<22} {wsgi:7.2f}s  {args.requests / wsgi:8.1f} req/s")
+    print(f"  {'ASGI (1 event loop):':<22} {asgi:7.2f}s  {args.requests / asgi:8.1f} req/s")
+
+
+if __name__ == '__main__':
+    main()
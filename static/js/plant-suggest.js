@@ -0,0 +1,104 @@
+// ZFarming plant name typeahead
+//
+// Any input with a data-plant-suggest="<suggest endpoint>" attribute gets a
+// dropdown of matching plants. Requests are debounced, in-flight requests
+// are cancelled by newer keystrokes and answers are cached per query.
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('input[data-plant-suggest]').forEach(initPlantSuggest);
+});
+
+function initPlantSuggest(input) {
+    const endpoint = input.dataset.plantSuggest;
+    const cache = new Map();
+    let debounceTimer;
+    let controller;
+    let activeIndex = -1;
+
+    const menu = document.createElement('ul');
+    menu.className = 'dropdown-menu w-100 shadow-sm';
+    menu.setAttribute('role', 'listbox');
+    input.parentNode.classList.add('position-relative');
+    input.parentNode.appendChild(menu);
+    input.setAttribute('autocomplete', 'off');
+
+    function hide() {
+        menu.classList.remove('show');
+        activeIndex = -1;
+    }
+
+    function render(results) {
+        menu.innerHTML = '';
+        results.forEach(function(plant) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.className = 'dropdown-item';
+            link.href = plant.url;
+            link.textContent = plant.name;
+            const scientific = document.createElement('small');
+            scientific.className = 'text-muted fst-italic ms-2';
+            scientific.textContent = plant.scientific_name;
+            link.appendChild(scientific);
+            item.appendChild(link);
+            menu.appendChild(item);
+        });
+        activeIndex = -1;
+        menu.classList.toggle('show', results.length > 0);
+    }
+
+    function fetchSuggestions(query) {
+        if (cache.has(query)) {
+            render(cache.get(query));
+            return;
+        }
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+        fetch(endpoint + '?q=' + encodeURIComponent(query), { signal: controller.signal })
+            .then(function(response) { return response.json(); })
+            .then(function(data) {
+                cache.set(query, data.results);
+                if (input.value.trim() === query) {
+                    render(data.results);
+                }
+            })
+            .catch(function(error) {
+                if (error.name !== 'AbortError') {
+                    hide();
+                }
+            });
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(debounceTimer);
+        const query = input.value.trim();
+        if (query.length < 2) {
+            hide();
+            return;
+        }
+        debounceTimer = setTimeout(function() { fetchSuggestions(query); }, 150);
+    });
+
+    input.addEventListener('keydown', function(e) {
+        const items = menu.querySelectorAll('.dropdown-item');
+        if (!menu.classList.contains('show') || items.length === 0) {
+            return;
+        }
+        if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+            e.preventDefault();
+            activeIndex = (activeIndex + (e.key === 'ArrowDown' ? 1 : -1) + items.length) % items.length;
+            items.forEach(function(item, i) { item.classList.toggle('active', i === activeIndex); });
+        } else if (e.key === 'Enter' && activeIndex >= 0) {
+            e.preventDefault();
+            window.location.href = items[activeIndex].href;
+        } else if (e.key === 'Escape') {
+            hide();
+        }
+    });
+
+    input.addEventListener('blur', function() {
+        // Let a click on a suggestion land before the menu closes
+        setTimeout(hide, 150);
+    });
+}
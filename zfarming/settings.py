@@ -52,6 +52,7 @@ INSTALLED_APPS = [
     
     # Third party apps (for templates)
     'compressor',
+    'rest_framework',
     
     # Local apps
     'apps.core',
@@ -83,6 +84,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'apps.core.context_processors.site_context',
+                'apps.plants.context_processors.catalog',
             ],
         },
     },
@@ -196,14 +198,148 @@ CORS_ALLOWED_ORIGINS = [
 PLANT_ID_API_KEY = env('PLANT_ID_API_KEY')
 PLANT_ID_API_URL = 'https://api.plant.id/v3/identification'
 
-# Cache settings
-CACHES = {
-    'default': {
+# Plant.id HTTP client (shared keep-alive pool, retries, circuit breaker)
+PLANT_ID_CONNECT_TIMEOUT = env.float('PLANT_ID_CONNECT_TIMEOUT', default=3.05)
+PLANT_ID_READ_TIMEOUT = env.float('PLANT_ID_READ_TIMEOUT', default=30)
+PLANT_ID_MAX_RETRIES = env.int('PLANT_ID_MAX_RETRIES', default=2)
+PLANT_ID_BACKOFF_FACTOR = env.float('PLANT_ID_BACKOFF_FACTOR', default=0.5)
+# Longest wait in seconds for a Retry-After header before retrying
+PLANT_ID_MAX_RETRY_AFTER = env.float('PLANT_ID_MAX_RETRY_AFTER', default=10)
+PLANT_ID_POOL_SIZE = env.int('PLANT_ID_POOL_SIZE', default=10)
+PLANT_ID_ASYNC_POOL_SIZE = env.int('PLANT_ID_ASYNC_POOL_SIZE', default=100)  # ASGI views
+PLANT_ID_CIRCUIT_FAILURE_THRESHOLD = env.int('PLANT_ID_CIRCUIT_FAILURE_THRESHOLD', default=5)
+PLANT_ID_CIRCUIT_RESET_TIMEOUT = env.int('PLANT_ID_CIRCUIT_RESET_TIMEOUT', default=60)
+
+# Run identifications on a background worker pool and let the results page poll
+PLANT_ID_ASYNC = env.bool('PLANT_ID_ASYNC', default=False)
+PLANT_ID_WORKER_THREADS = env.int('PLANT_ID_WORKER_THREADS', default=4)
+# Seconds after which pending jobs (processing ones: since they were claimed) are queued
+# again by manage.py recover_identifications, and after which jobs are failed instead
+PLANT_ID_JOB_STALE_AFTER = env.int('PLANT_ID_JOB_STALE_AFTER', default=300)
+PLANT_ID_JOB_EXPIRE_AFTER = env.int('PLANT_ID_JOB_EXPIRE_AFTER', default=60 * 60)
+# Seconds the results page polls a job before it reports a failure
+PLANT_ID_JOB_POLL_TIMEOUT = env.int('PLANT_ID_JOB_POLL_TIMEOUT', default=120)
+
+# Stored identification history: number of suggestions kept, and whether the
+# upstream payload is archived (zlib-compressed) alongside them
+PLANT_ID_STORED_RESULTS = env.int('PLANT_ID_STORED_RESULTS', default=3)
+PLANT_ID_STORE_RAW_RESPONSE = env.bool('PLANT_ID_STORE_RAW_RESPONSE', default=True)
+
+# Batch identification (/api/scanner/identify/ with several images)
+PLANT_ID_BATCH_MAX_IMAGES = env.int('PLANT_ID_BATCH_MAX_IMAGES', default=10)
+PLANT_ID_BATCH_CONCURRENCY = env.int('PLANT_ID_BATCH_CONCURRENCY', default=4)
+
+# Minimum trigram similarity (0-1) for fuzzy catalog matches of identification results
+PLANT_MATCH_SIMILARITY_THRESHOLD = env.float('PLANT_MATCH_SIMILARITY_THRESHOLD', default=0.45)
+
+# Plant identification image preprocessing (applied before upload to Plant.id)
+PLANT_ID_IMAGE_MAX_DIMENSION = env.int('PLANT_ID_IMAGE_MAX_DIMENSION', default=1280)
+PLANT_ID_IMAGE_QUALITY = env.int('PLANT_ID_IMAGE_QUALITY', default=85)
+PLANT_ID_IMAGE_FORMAT = env('PLANT_ID_IMAGE_FORMAT', default='JPEG')  # JPEG or WEBP
+
+# Plant identification result cache (keyed by image content hash)
+PLANT_ID_CACHE_ALIAS = 'plant_identification'
+PLANT_ID_CACHE_TTL = env.int('PLANT_ID_CACHE_TTL', default=60 * 60 * 24)  # 24 hours
+PLANT_ID_CACHE_MAX_ENTRIES = env.int('PLANT_ID_CACHE_MAX_ENTRIES', default=1000)
+
+# Plant Finder: ranked plants kept per preference combination
+FINDER_RECOMMENDATION_TABLE_SIZE = env.int('FINDER_RECOMMENDATION_TABLE_SIZE', default=24)
+# Seconds a signed-in user's personalized ranking is cached (profile changes invalidate it)
+FINDER_PERSONALIZED_CACHE_TTL = env.int('FINDER_PERSONALIZED_CACHE_TTL', default=3600)
+
+# Plant search: PostgreSQL text search configuration (stemming language)
+PLANT_SEARCH_CONFIG = env('PLANT_SEARCH_CONFIG', default='english')
+# Seconds facet counts are cached per filter combination (catalog changes invalidate them)
+PLANT_FACET_CACHE_TTL = env.int('PLANT_FACET_CACHE_TTL', default=600)
+
+# Listing pagination: 'offset' (?page=N) or 'keyset' (cursor, constant cost per page)
+PAGINATION_STYLE = env('PAGINATION_STYLE', default='offset')
+# Seconds a listing's total count is cached (catalog changes invalidate it)
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', default=600)
+
+# Seconds cached catalog reads live (catalog changes invalidate them sooner)
+CATALOG_CACHE_TTL = env.int('CATALOG_CACHE_TTL', default=60 * 60 * 24)
+
+# HTTP caching of catalog pages and API reads (ETag/Last-Modified revalidate after expiry)
+CATALOG_HTTP_MAX_AGE = env.int('CATALOG_HTTP_MAX_AGE', default=60)
+# Seconds shared caches (nginx, CDN) may serve catalog responses before revalidating
+CATALOG_HTTP_SHARED_MAX_AGE = env.int('CATALOG_HTTP_SHARED_MAX_AGE', default=300)
+
+# Plant image renditions: name -> (width, height) box in CSS pixels, made at 1x and 2x
+PLANT_IMAGE_RENDITIONS = {
+    'thumbnail': (50, 50),
+    'card': (400, 300),
+    'detail': (800, 600),
+}
+PLANT_IMAGE_RENDITION_QUALITY = env.int('PLANT_IMAGE_RENDITION_QUALITY', default=80)
+# Make all renditions when an image is uploaded (otherwise each on first use)
+PLANT_IMAGE_RENDITIONS_ON_UPLOAD = env.bool('PLANT_IMAGE_RENDITIONS_ON_UPLOAD', default=True)
+
+# "Similar plants": neighbours stored per plant by manage.py compute_plant_similarity
+PLANT_SIMILARITY_NEIGHBOURS = env.int('PLANT_SIMILARITY_NEIGHBOURS', default=10)
+
+# Cache settings: with REDIS_URL every worker shares one Redis cache (L2), fronted
+# by a small per-process L1 for hot keys. Without it the shared tier is
+# in-process LocMem; REDIS_URL=fakeredis:// runs the Redis client in memory
+# (needs fakeredis[lua]) to exercise the Redis path without a server.
+REDIS_URL = env('REDIS_URL', default='')
+# Seconds hot keys are served from the per-process L1 (0 disables it)
+CACHE_L1_TIMEOUT = env.int('CACHE_L1_TIMEOUT', default=5)
+CACHE_L1_MAX_ENTRIES = env.int('CACHE_L1_MAX_ENTRIES', default=1000)
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'zfarming',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        },
+    }
+    if REDIS_URL.startswith('fakeredis://'):
+        from fakeredis import FakeConnection
+
+        SHARED_CACHE['LOCATION'] = 'redis://localhost:6379/0'
+        SHARED_CACHE['OPTIONS']['CONNECTION_POOL_KWARGS'] = {'connection_class': FakeConnection}
+else:
+    SHARED_CACHE = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'LOCATION': 'zfarming-shared',
     }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'apps.core.cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'L1_TIMEOUT': CACHE_L1_TIMEOUT,
+            'L1_MAX_ENTRIES': CACHE_L1_MAX_ENTRIES,
+        },
+    },
+    # Consistent across workers at once; sessions live here
+    'shared': SHARED_CACHE,
+    # Use django.core.cache.backends.filebased.FileBasedCache with a directory
+    # LOCATION to keep identification results on local disk across restarts.
+    PLANT_ID_CACHE_ALIAS: {
+        'BACKEND': env(
+            'PLANT_ID_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': env('PLANT_ID_CACHE_LOCATION', default='plant-identification'),
+        'TIMEOUT': PLANT_ID_CACHE_TTL,
+        'OPTIONS': {
+            'MAX_ENTRIES': PLANT_ID_CACHE_MAX_ENTRIES,
+        },
+    },
 }
 
+# Sessions: Redis-backed when REDIS_URL is set, otherwise cached in front of the database
+SESSION_ENGINE = env(
+    'SESSION_ENGINE',
+    default='django.contrib.sessions.backends.cache' if REDIS_URL else 'django.contrib.sessions.backends.cached_db'
+)
+SESSION_CACHE_ALIAS = 'shared'
+
 # Security settings - properly configured for development vs production
 if DEBUG:
     # Development settings - no HTTPS enforcement
@@ -278,6 +414,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # httpx logs every request at INFO
+        'httpx': {
+            'level': 'WARNING',
+        },
     },
 }
 
@@ -30,6 +30,7 @@ urlpatterns = [
     path('finder/', include('apps.finder.urls')),
     path('care/', include('apps.care.urls')),
     path('accounts/', include('apps.accounts.urls')),
+    path('api/', include('apps.api.urls')),
     path('status/', TestTemplateView.as_view(), name='status'),  # Keep for testing
 ]
 